@@ -13,7 +13,7 @@ from config import settings
 
 # Import all models so Alembic can detect them
 from app.models.user import User  # noqa
-from app.models.book import Book, Review  # noqa
+from app.models.book import Book, BookStats, Review  # noqa
 from app.models.document import Document, Ingestion  # noqa
 
 config = context.config
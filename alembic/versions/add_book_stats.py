@@ -0,0 +1,54 @@
+"""add book_stats rating aggregate
+
+Revision ID: add_book_stats
+Revises: server_side_timestamps
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_book_stats"
+down_revision = "server_side_timestamps"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "book_stats",
+        sa.Column(
+            "book_id",
+            sa.Integer(),
+            sa.ForeignKey("books.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("review_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rating_sum", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("avg_rating", sa.Float(), nullable=False, server_default="0"),
+    )
+    # Backfill every existing book, including those without reviews
+    op.execute(
+        """
+        INSERT INTO book_stats (book_id, review_count, rating_sum, avg_rating)
+        SELECT b.id, COUNT(r.id), COALESCE(SUM(r.rating), 0), COALESCE(AVG(r.rating), 0)
+        FROM books b LEFT JOIN reviews r ON r.book_id = b.id
+        GROUP BY b.id
+        """
+    )
+    op.create_index(
+        "ix_book_stats_top_rated",
+        "book_stats",
+        [sa.text("avg_rating DESC")],
+        unique=False,
+        postgresql_where=sa.text("review_count >= 3"),
+        sqlite_where=sa.text("review_count >= 3"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_book_stats_top_rated", table_name="book_stats")
+    op.drop_table("book_stats")
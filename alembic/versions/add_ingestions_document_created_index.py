@@ -0,0 +1,28 @@
+"""add ingestions (document_id, created_at) index
+
+Revision ID: add_ingestions_document_created
+Revises: add_books_documents
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_ingestions_document_created"
+down_revision = "add_books_documents"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_ingestions_document_id_created_at",
+        "ingestions",
+        ["document_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_ingestions_document_id_created_at", table_name="ingestions")
@@ -0,0 +1,35 @@
+"""add composite indexes for document and review listings
+
+Revision ID: add_list_composite_indexes
+Revises: add_ingestions_document_created
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_list_composite_indexes"
+down_revision = "add_ingestions_document_created"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_documents_ingestion_status_created_at",
+        "documents",
+        ["ingestion_status", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_reviews_book_id_created_at",
+        "reviews",
+        ["book_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_reviews_book_id_created_at", table_name="reviews")
+    op.drop_index("ix_documents_ingestion_status_created_at", table_name="documents")
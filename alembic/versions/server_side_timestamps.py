@@ -0,0 +1,54 @@
+"""use server-side defaults for created_at/updated_at
+
+Revision ID: server_side_timestamps
+Revises: add_list_composite_indexes
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "server_side_timestamps"
+down_revision = "add_list_composite_indexes"
+branch_labels = None
+depends_on = None
+
+TABLES = ["users", "books", "reviews", "documents", "ingestions"]
+COLUMNS = ["created_at", "updated_at"]
+
+
+def upgrade():
+    for table in TABLES:
+        for column in COLUMNS:
+            # Backfill rows written before the columns became NOT NULL
+            op.execute(
+                f"UPDATE {table} SET {column} = CURRENT_TIMESTAMP "
+                f"WHERE {column} IS NULL"
+            )
+            # Existing values were written as naive UTC
+            op.alter_column(
+                table,
+                column,
+                existing_type=sa.DateTime(),
+                type_=sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                nullable=False,
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            )
+
+
+def downgrade():
+    for table in TABLES:
+        for column in COLUMNS:
+            op.alter_column(
+                table,
+                column,
+                existing_type=sa.DateTime(timezone=True),
+                type_=sa.DateTime(),
+                server_default=None,
+                nullable=True,
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            )
@@ -1,5 +1,6 @@
 import os
 import uuid
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -10,7 +11,7 @@ from fastapi.exceptions import RequestValidationError
 from app.core.error_handler import global_exception_handler
 from app.core.logging import get_logger
 from app.http.middleware import LoggingMiddleware, RateLimitMiddleware
-from config import settings
+from config import settings, validate_production_secrets
 from routes.api import register_api_routes
 
 # Import all models to ensure SQLAlchemy can resolve relationships
@@ -22,8 +23,19 @@ from app.models.document import Document, Ingestion  # noqa: F401
 # Initialize logger
 logger = get_logger("app")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Refuse to serve with placeholder secrets
+    if settings.APP_ENV == "production":
+        validate_production_secrets(settings)
+    yield
+
+
 app = FastAPI(
-    title=settings.APP_NAME, openapi_url="/openapi.json", debug=settings.APP_DEBUG
+    title=settings.APP_NAME,
+    openapi_url="/openapi.json",
+    debug=settings.APP_DEBUG,
+    lifespan=lifespan,
 )
 
 # Log application startup
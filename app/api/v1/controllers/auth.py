@@ -1,13 +1,14 @@
+import asyncio
 from datetime import timedelta
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core import security
 from app.core.broadcasting import broadcast
-from app.core.database import get_db
+from app.core.database_async import get_async_db
 from app.core.logging import get_logger
 from app.events.user_events import UserCreated
 from app.jobs.tasks import process_user_data, send_welcome_email
@@ -21,12 +22,15 @@ logger = get_logger("auth")
 
 
 @router.post("/login", response_model=TokenWithUser)
-def login(
-    db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()
+async def login(
+    db: AsyncSession = Depends(get_async_db),
+    form_data: OAuth2PasswordRequestForm = Depends(),
 ) -> Any:
     try:
         logger.info(f"Login attempt: {form_data.username}")
-        user = User.authenticate(db, email=form_data.username, password=form_data.password)
+        user = await User.authenticate_async(
+            db, email=form_data.username, password=form_data.password
+        )
         if not user:
             logger.warning(f"Failed login: {form_data.username}")
             raise HTTPException(
@@ -53,23 +57,35 @@ def login(
 
 
 @router.post("/register", response_model=UserResponse)
-def register(
+async def register(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_in: UserCreate,
 ) -> Any:
     try:
         logger.info(f"Registration: {user_in.email}")
-        existing = User.get_by_email(db, email=user_in.email)
+        existing = await User.get_by_email_async(db, email=user_in.email)
         if existing:
             raise HTTPException(status_code=400, detail="Email already exists")
-        
-        user = User.create(db, obj_in=user_in)
+
+        # bcrypt is deliberately slow; keep it off the event loop
+        hashed_password = await asyncio.to_thread(
+            security.get_password_hash, user_in.password
+        )
+        user = await User.create_async(
+            db,
+            email=user_in.email,
+            hashed_password=hashed_password,
+            full_name=user_in.full_name,
+            is_superuser=user_in.is_superuser,
+        )
+        # Commit before queueing so workers can see the new row
+        await db.commit()
         logger.info(f"User registered: {user.email}")
 
         # Try to queue background tasks (don't fail if Celery is down)
         try:
-            send_welcome_email.delay(user.id)
+            send_welcome_email.delay(user.id, user.email, user.full_name)
             process_user_data.delay(user.id)
         except Exception as e:
             logger.warning(f"Couldn't queue tasks: {e}")
@@ -99,12 +99,13 @@ async def update_book(
     current_user: User = Depends(get_current_active_user_async),
 ) -> Any:
     """Update a book."""
-    book = await Book.get(db, id=book_id)
+    update_data = book_in.model_dump(exclude_unset=True)
+    if update_data:
+        book = await Book.update_by_id(db, book_id, **update_data)
+    else:
+        book = await Book.get(db, id=book_id)
     if not book:
         raise HTTPException(status_code=404, detail="Book not found")
-
-    update_data = book_in.model_dump(exclude_unset=True)
-    book = await Book.update(db, book, **update_data)
     return book
 
 
@@ -163,6 +164,10 @@ async def create_review(
         review_text=review_in.review_text,
         rating=review_in.rating,
     )
+    # Commit first so a concurrent request can't re-cache the old history
+    await db.commit()
+    # The user's review history drives their recommendations
+    recommendation_service.invalidate_user(current_user.id)
     return review
 
 
@@ -197,22 +202,20 @@ async def get_book_summary(
     if not book:
         raise HTTPException(status_code=404, detail="Book not found")
 
-    # Get reviews
-    reviews = await Review.get_by_book(db, book_id=book_id)
-    average_rating = await Review.get_average_rating(db, book_id=book_id)
+    average_rating, total_reviews = await Review.get_rating_stats(db, book_id=book_id)
 
     # Simple local summary based only on ratings (no external AI)
     review_summary = None
-    if reviews and average_rating is not None:
+    if total_reviews:
         review_summary = (
             f"Average rating: {average_rating:.1f}/5 "
-            f"based on {len(reviews)} review(s)."
+            f"based on {total_reviews} review(s)."
         )
 
     return BookSummaryResponse(
         book=book,
         average_rating=average_rating,
-        total_reviews=len(reviews),
+        total_reviews=total_reviews,
         summary=review_summary,
     )
 
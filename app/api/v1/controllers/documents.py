@@ -11,7 +11,11 @@ from app.core.security_async import (
 )
 from app.models.document import Document, Ingestion, IngestionStatus
 from app.models.user import User
-from app.schemas.document import DocumentResponse, IngestionResponse
+from app.schemas.document import (
+    DocumentMetadataResponse,
+    DocumentResponse,
+    IngestionResponse,
+)
 from app.services.rag import rag_service
 from config import settings
 
@@ -71,7 +75,7 @@ async def upload_document(
     return document
 
 
-@router.get("", response_model=List[DocumentResponse])
+@router.get("", response_model=List[DocumentMetadataResponse])
 async def get_documents(
     *,
     db: AsyncSession = Depends(get_async_db),
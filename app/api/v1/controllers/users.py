@@ -9,7 +9,7 @@ from app.core.cache import cache
 from app.core.database import get_db
 from app.core.logging import get_logger
 from app.core.policies import UserPolicy
-from app.core.security import get_current_user
+from app.core.security import get_current_user, get_password_hash
 from app.events.user_events import UserDeleted, UserUpdated
 from app.models.user import User
 from app.schemas.user import UserResponse, UserUpdate
@@ -41,7 +41,12 @@ def update_user_me(
     try:
         logger.info(f"User {current_user.id} updating profile")
         UserPolicy.update(current_user, current_user.id)
-        user = User.update(db, db_obj=current_user, obj_in=user_in)
+        hashed_password = (
+            get_password_hash(user_in.password) if user_in.password else None
+        )
+        user = User.update(
+            db, db_obj=current_user, obj_in=user_in, hashed_password=hashed_password
+        )
 
         # Example: Invalidate cache after update
         try:
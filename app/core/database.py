@@ -60,9 +60,9 @@ SQLALCHEMY_DATABASE_URL = get_database_url()
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     pool_pre_ping=True,  # Verify connections before using
-    pool_recycle=3600,  # Recycle connections after 1 hour
-    pool_size=5,  # Number of connections to maintain
-    max_overflow=10,  # Maximum overflow connections
+    pool_recycle=settings.DB_POOL_RECYCLE,  # Recycle connections (seconds)
+    pool_size=settings.DB_POOL_SIZE,  # Number of connections to maintain
+    max_overflow=settings.DB_MAX_OVERFLOW,  # Maximum overflow connections
     connect_args=get_connect_args(),
 )
 
@@ -38,9 +38,9 @@ async_engine = create_async_engine(
     ASYNC_DATABASE_URL,
     echo=settings.APP_DEBUG,
     pool_pre_ping=True,
-    pool_recycle=3600,
-    pool_size=5,
-    max_overflow=10,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
 )
 
 # Create async session factory
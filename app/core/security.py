@@ -2,6 +2,7 @@ import base64
 import hashlib
 import logging
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Any
 
 from fastapi import Depends, HTTPException, status
@@ -95,6 +96,18 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(prepared_password)
 
 
+@lru_cache
+def get_dummy_password_hash() -> str:
+    """
+    Hash of a throwaway password, verified against when a login email is
+    unknown so that misses cost the same bcrypt work as wrong passwords.
+
+    Returns:
+        Bcrypt hash of a sentinel password
+    """
+    return get_password_hash("unused-sentinel")
+
+
 def get_current_user(
     db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
 ) -> "User":
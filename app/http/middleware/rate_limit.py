@@ -1,8 +1,9 @@
 """Rate Limit Middleware"""
 
-import json
+import ipaddress
 import logging
 import time
+from collections import OrderedDict
 from collections.abc import Callable
 
 from fastapi import Request, Response
@@ -13,12 +14,29 @@ from config import settings
 
 logger = logging.getLogger(__name__)
 
+# The rejection body never changes, so it is encoded once
+TOO_MANY_REQUESTS_BODY = b'{"detail":"Too many requests"}'
+
+# Add the locally counted hits to the client's window counter and start its TTL
+# on the first write, atomically and in a single round-trip, so no key can be
+# left behind without a TTL.
+RATE_LIMIT_SCRIPT = """
+local count = redis.call('INCRBY', KEYS[1], ARGV[1])
+if count == tonumber(ARGV[1]) then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return count
+"""
+
+# Upper bound on (ip, window) entries kept for local counting
+LOCAL_COUNTS_MAX_SIZE = 10_000
+
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """
     Rate limiting middleware.
-    NOTE: This uses in-memory storage and won't work across multiple servers.
-    For production, use Redis-based rate limiting.
+    Uses Redis for distributed rate limiting when it is reachable, otherwise
+    falls back to in-memory storage (which won't work across multiple servers).
     """
 
     def __init__(self, app: ASGIApp):
@@ -26,50 +44,132 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         self.rate_limit = settings.RATE_LIMIT
         self.rate_limit_window = settings.RATE_LIMIT_WINDOW
         self.requests = {}
+        # (ip, window) -> [hits not yet sent to Redis, last count Redis returned]
+        self.local_counts: OrderedDict[tuple[str, int], list[int]] = OrderedDict()
+        self.sync_every = max(1, settings.RATE_LIMIT_SYNC_EVERY)
+        self.sync_threshold = self.rate_limit * 0.9
+        self.trusted_proxies = tuple(
+            ipaddress.ip_network(proxy, strict=False)
+            for proxy in settings.TRUSTED_PROXIES
+        )
 
-        # Try to use Redis for distributed rate limiting if available
+        # Try to use Redis for distributed rate limiting if available.
+        # The async client keeps Redis I/O off the event loop; connectivity is
+        # probed on the first request since __init__ can't await.
         try:
-            from redis import Redis
+            from redis.asyncio import ConnectionPool, Redis
 
             self.redis = Redis(
-                host=settings.REDIS_HOST,
-                port=settings.REDIS_PORT,
-                db=settings.REDIS_DB,
-                password=settings.REDIS_PASSWORD,
-                decode_responses=True,
+                connection_pool=ConnectionPool(
+                    host=settings.REDIS_HOST,
+                    port=settings.REDIS_PORT,
+                    db=settings.REDIS_DB,
+                    password=settings.REDIS_PASSWORD,
+                    decode_responses=True,
+                    max_connections=64,
+                )
             )
-            # Test connection
-            self.redis.ping()
+            # Script objects run via EVALSHA and reload the script on NOSCRIPT
+            self.rate_limit_script = self.redis.register_script(RATE_LIMIT_SCRIPT)
             self.use_redis = True
         except Exception:
-            self.redis = None
-            self.use_redis = False
-            if settings.APP_ENV == "production":
-                logger.warning(
-                    "Rate limiting using in-memory storage. For production, configure Redis."
-                )
+            self._disable_redis()
+        self._redis_checked = not self.use_redis
+
+    def _disable_redis(self) -> None:
+        self.redis = None
+        self.use_redis = False
+        if settings.APP_ENV == "production":
+            logger.warning(
+                "Rate limiting using in-memory storage. "
+                "For production, configure Redis."
+            )
+
+    async def _check_redis(self) -> None:
+        """Test the Redis connection once, falling back to in-memory on failure."""
+        self._redis_checked = True
+        try:
+            await self.redis.ping()
+        except Exception:
+            self._disable_redis()
+
+    def _is_trusted_proxy(self, host: str) -> bool:
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            return False
+        return any(address in network for network in self.trusted_proxies)
+
+    def _get_client_ip(self, request: Request) -> str:
+        """
+        Resolve the client IP, honouring X-Forwarded-For only when the direct
+        peer is a trusted proxy. The rightmost entry is the address that proxy
+        saw, so only that token is parsed.
+        """
+        peer = request.client.host if request.client else "unknown"
+        if self.trusted_proxies and self._is_trusted_proxy(peer):
+            forwarded_for = request.headers.get("x-forwarded-for")
+            if forwarded_for:
+                return forwarded_for.rsplit(",", 1)[-1].strip() or peer
+        return peer
+
+    async def _is_limited_redis(self, client_ip: str, current_time: float) -> bool:
+        """
+        Count the hit locally and only sync with Redis every sync_every hits,
+        or on every hit once the client nears the limit. Between syncs each
+        process may over-allow by at most sync_every - 1 requests.
+        """
+        window = int(current_time // self.rate_limit_window)
+        local_key = (client_ip, window)
+        entry = self.local_counts.get(local_key)
+        if entry is None:
+            entry = self.local_counts[local_key] = [0, 0]
+            if len(self.local_counts) > LOCAL_COUNTS_MAX_SIZE:
+                self.local_counts.popitem(last=False)
+        else:
+            self.local_counts.move_to_end(local_key)
+
+        entry[0] += 1
+        estimate = entry[0] + entry[1]
+        if estimate > self.rate_limit:
+            return True
+        if entry[0] < self.sync_every and estimate < self.sync_threshold:
+            return False
+
+        # Reset before awaiting so concurrent requests don't resend the delta
+        delta, entry[0] = entry[0], 0
+        try:
+            entry[1] = await self.rate_limit_script(
+                keys=[f"rate_limit:{client_ip}:{window}"],
+                args=[delta, self.rate_limit_window],
+            )
+        except Exception:
+            entry[0] += delta
+            raise
+        return entry[1] > self.rate_limit
 
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        client_ip = request.client.host if request.client else "unknown"
+        client_ip = self._get_client_ip(request)
         current_time = time.time()
 
+        if not self._redis_checked:
+            await self._check_redis()
+
         # Use Redis if available for distributed rate limiting
         if self.use_redis and self.redis:
             try:
-                key = f"rate_limit:{client_ip}"
-                count = self.redis.incr(key)
-                if count == 1:
-                    self.redis.expire(key, self.rate_limit_window)
-
-                if count > self.rate_limit:
+                limited = await self._is_limited_redis(client_ip, current_time)
+            except Exception:
+                # Fallback to in-memory if Redis fails
+                pass
+            else:
+                if limited:
                     return Response(
-                        content=json.dumps({"detail": "Too many requests"}),
+                        content=TOO_MANY_REQUESTS_BODY,
                         status_code=429,
                         media_type="application/json",
                     )
-            except Exception:
-                # Fallback to in-memory if Redis fails
-                pass
+                return await call_next(request)
 
         # In-memory rate limiting (fallback or if Redis not available)
         self.requests = {
@@ -81,7 +181,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         if client_ip in self.requests:
             if len(self.requests[client_ip]) >= self.rate_limit:
                 return Response(
-                    content=json.dumps({"detail": "Too many requests"}),
+                    content=TOO_MANY_REQUESTS_BODY,
                     status_code=429,
                     media_type="application/json",
                 )
@@ -1,21 +1,79 @@
+from celery.signals import task_postrun, worker_process_init
+from sqlalchemy import select
+from sqlalchemy.orm import scoped_session
+
 from app.core.celery_app import celery_app
-from app.core.database import SessionLocal
+from app.core.database import SessionLocal, engine
 from app.models.user import User
 
+# One session per worker thread, reused across tasks instead of being
+# constructed (and checking out a fresh connection) on every invocation
+Session = scoped_session(SessionLocal)
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    """
+    Drop pooled connections inherited from the parent process after fork,
+    so each worker process warms up its own pool.
+    """
+    engine.dispose(close=False)
+
+
+@task_postrun.connect
+def remove_task_session(**kwargs):
+    """
+    Return the task's connection to the pool and reset the session state.
+    """
+    Session.remove()
+
+
+def _get_users(user_ids: list[int]) -> list[User]:
+    """
+    Load all requested users with a single WHERE id IN (...) query.
+    """
+    db = Session()
+    return list(db.execute(select(User).where(User.id.in_(user_ids))).scalars().all())
+
+
+def _send_welcome_email(email: str, full_name: str | None = None):
+    # Implement email sending logic here
+    print(f"Sending welcome email to {email}")
+
+
+@celery_app.task(name="send_welcome_emails")
+def send_welcome_emails(user_ids: list[int]):
+    """
+    Send welcome emails to a batch of new users.
+    Large backfills can be split with send_welcome_emails.chunks(...).
+    """
+    for user in _get_users(user_ids):
+        _send_welcome_email(user.email, user.full_name)
+
 
 @celery_app.task(name="send_welcome_email")
-def send_welcome_email(user_id: int):
+def send_welcome_email(
+    user_id: int, email: str | None = None, full_name: str | None = None
+):
+    """
+    Send welcome email to new user.
+    The address is passed in at enqueue time so no query is needed; the user
+    is only loaded for messages queued without it.
+    """
+    if email is None:
+        send_welcome_emails(user_ids=[user_id])
+        return
+    _send_welcome_email(email, full_name)
+
+
+@celery_app.task(name="process_users_data")
+def process_users_data(user_ids: list[int]):
     """
-    Send welcome email to new user
+    Process data for a batch of users asynchronously
     """
-    db = SessionLocal()
-    try:
-        user = db.query(User).filter(User.id == user_id).first()
-        if user:
-            # Implement email sending logic here
-            print(f"Sending welcome email to {user.email}")
-    finally:
-        db.close()
+    for user in _get_users(user_ids):
+        # Implement data processing logic here
+        print(f"Processing data for user {user.email}")
 
 
 @celery_app.task(name="process_user_data")
@@ -23,11 +81,4 @@ def process_user_data(user_id: int):
     """
     Process user data asynchronously
     """
-    db = SessionLocal()
-    try:
-        user = db.query(User).filter(User.id == user_id).first()
-        if user:
-            # Implement data processing logic here
-            print(f"Processing data for user {user.email}")
-    finally:
-        db.close()
+    process_users_data(user_ids=[user_id])
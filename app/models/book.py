@@ -1,8 +1,21 @@
-from datetime import datetime
 from typing import Optional, TYPE_CHECKING
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, Float
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+    select,
+    update as sa_update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import raiseload, relationship, selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database_async import AsyncBase
@@ -16,6 +29,8 @@ except ImportError:
 
 class Book(AsyncBase):
     __tablename__ = "books"
+    # Fetch server-generated timestamps in the INSERT/UPDATE itself (RETURNING)
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False, index=True)
@@ -23,33 +38,48 @@ class Book(AsyncBase):
     genre = Column(String, nullable=False, index=True)
     year_published = Column(Integer, nullable=False)
     summary = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=lambda: datetime.utcnow())
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
     updated_at = Column(
-        DateTime,
-        default=lambda: datetime.utcnow(),
-        onupdate=lambda: datetime.utcnow(),
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
     )
 
     reviews = relationship("Review", back_populates="book", cascade="all, delete-orphan")
+    stats = relationship("BookStats", uselist=False, cascade="all, delete-orphan")
 
     @classmethod
     async def get(cls, db: AsyncSession, id: int) -> Optional["Book"]:
-        from sqlalchemy import select
         result = await db.execute(select(cls).filter(cls.id == id))
         return result.scalar_one_or_none()
 
     @classmethod
     async def get_all(cls, db: AsyncSession, skip: int = 0, limit: int = 100) -> list["Book"]:
-        from sqlalchemy import select
-        result = await db.execute(select(cls).offset(skip).limit(limit))
+        """Get books without their reviews; touching book.reviews raises."""
+        result = await db.execute(
+            select(cls).options(raiseload("*")).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all())
+
+    @classmethod
+    async def get_all_with_reviews(
+        cls, db: AsyncSession, skip: int = 0, limit: int = 100
+    ) -> list["Book"]:
+        """Get books with their reviews loaded in one extra query (no N+1)."""
+        result = await db.execute(
+            select(cls).options(selectinload(cls.reviews)).offset(skip).limit(limit)
+        )
         return list(result.scalars().all())
 
     @classmethod
     async def create(cls, db: AsyncSession, **kwargs) -> "Book":
-        db_obj = cls(**kwargs)
+        # Seed the stats row so reviews only ever need to increment it
+        db_obj = cls(**kwargs, stats=BookStats())
         db.add(db_obj)
         await db.flush()  # Flush to get the ID without committing
-        await db.refresh(db_obj)
         return db_obj
 
     @classmethod
@@ -57,11 +87,26 @@ class Book(AsyncBase):
         """Update a book."""
         for key, value in kwargs.items():
             setattr(db_obj, key, value)
-        db_obj.updated_at = datetime.utcnow()
         await db.flush()  # Flush instead of commit (commit handled by dependency)
-        await db.refresh(db_obj)
         return db_obj
 
+    @classmethod
+    async def update_by_id(
+        cls, db: AsyncSession, id: int, **kwargs
+    ) -> Optional["Book"]:
+        """
+        Update a book by ID with a single UPDATE ... RETURNING statement.
+        Use update() instead when the instance is already loaded.
+        """
+        result = await db.execute(
+            sa_update(cls)
+            .where(cls.id == id)
+            .values(**kwargs)
+            .returning(cls)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
     @classmethod
     async def delete(cls, db: AsyncSession, db_obj: "Book") -> None:
         """Delete a book."""
@@ -71,17 +116,25 @@ class Book(AsyncBase):
 
 class Review(AsyncBase):
     __tablename__ = "reviews"
+    __table_args__ = (
+        # Serves a book's reviews in created_at order without a sort step
+        Index("ix_reviews_book_id_created_at", "book_id", "created_at"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     book_id = Column(Integer, ForeignKey("books.id"), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     review_text = Column(Text, nullable=False)
     rating = Column(Integer, nullable=False)  # Rating from 1 to 5
-    created_at = Column(DateTime, default=lambda: datetime.utcnow())
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
     updated_at = Column(
-        DateTime,
-        default=lambda: datetime.utcnow(),
-        onupdate=lambda: datetime.utcnow(),
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
     )
 
     # Relationships
@@ -92,7 +145,6 @@ class Review(AsyncBase):
     @classmethod
     async def get(cls, db: AsyncSession, id: int) -> Optional["Review"]:
         """Get a review by ID."""
-        from sqlalchemy import select
         result = await db.execute(select(cls).filter(cls.id == id))
         return result.scalar_one_or_none()
 
@@ -100,10 +152,14 @@ class Review(AsyncBase):
     async def get_by_book(
         cls, db: AsyncSession, book_id: int, skip: int = 0, limit: int = 100
     ) -> list["Review"]:
-        """Get all reviews for a book."""
-        from sqlalchemy import select
+        """Get all reviews for a book; touching review.book raises."""
         result = await db.execute(
-            select(cls).filter(cls.book_id == book_id).offset(skip).limit(limit)
+            select(cls)
+            .options(raiseload("*"))
+            .filter(cls.book_id == book_id)
+            .order_by(cls.created_at.desc())
+            .offset(skip)
+            .limit(limit)
         )
         return list(result.scalars().all())
 
@@ -113,16 +169,76 @@ class Review(AsyncBase):
         db_obj = cls(**kwargs)
         db.add(db_obj)
         await db.flush()  # Flush to get the ID without committing
-        await db.refresh(db_obj)
+        await BookStats.add_rating(db, book_id=db_obj.book_id, rating=db_obj.rating)
         return db_obj
 
     @classmethod
-    async def get_average_rating(
+    async def get_average_rating(cls, db: AsyncSession, book_id: int) -> float:
+        """Get average rating for a book (0.0 when it has no reviews)."""
+        average_rating, _ = await cls.get_rating_stats(db, book_id=book_id)
+        return average_rating
+
+    @classmethod
+    async def get_rating_stats(
         cls, db: AsyncSession, book_id: int
-    ) -> Optional[float]:
-        """Get average rating for a book."""
-        from sqlalchemy import select, func
+    ) -> tuple[float, int]:
+        """Get (average rating, review count) for a book in a single query."""
         result = await db.execute(
-            select(func.avg(cls.rating)).filter(cls.book_id == book_id)
+            select(
+                func.coalesce(func.avg(cls.rating), 0.0), func.count(cls.id)
+            ).filter(cls.book_id == book_id)
+        )
+        average_rating, total_reviews = result.one()
+        return float(average_rating), int(total_reviews)
+
+
+class BookStats(AsyncBase):
+    """
+    Per-book rating aggregate, kept current as reviews are created so
+    top-rated listings read an index instead of scanning reviews.
+    """
+
+    __tablename__ = "book_stats"
+
+    book_id = Column(
+        Integer, ForeignKey("books.id", ondelete="CASCADE"), primary_key=True
+    )
+    review_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_sum = Column(Float, nullable=False, default=0.0, server_default="0")
+    avg_rating = Column(Float, nullable=False, default=0.0, server_default="0")
+
+    @classmethod
+    async def add_rating(cls, db: AsyncSession, book_id: int, rating: int) -> None:
+        """
+        Fold one new rating into a book's stats with a single atomic upsert.
+        Books without a stats row (e.g. inserted outside Book.create) get one
+        on their first review, and concurrent first reviews can't race.
+        """
+        # The async engine runs on PostgreSQL; tests run on SQLite
+        dialect = db.get_bind().dialect.name
+        insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        stmt = insert(cls).values(
+            book_id=book_id,
+            review_count=1,
+            rating_sum=float(rating),
+            avg_rating=float(rating),
         )
-        return result.scalar()
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[cls.book_id],
+                set_={
+                    "review_count": cls.review_count + 1,
+                    "rating_sum": cls.rating_sum + rating,
+                    "avg_rating": (cls.rating_sum + rating) / (cls.review_count + 1),
+                },
+            )
+        )
+
+
+# Top-rated listings only consider books with enough reviews to be meaningful
+Index(
+    "ix_book_stats_top_rated",
+    BookStats.avg_rating.desc(),
+    postgresql_where=BookStats.review_count >= 3,
+    sqlite_where=BookStats.review_count >= 3,
+)
@@ -1,8 +1,20 @@
-from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Column, DateTime, Integer, String, Text, Enum as SQLEnum, ForeignKey
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Enum as SQLEnum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+    select,
+    update as sa_update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 import enum
 
 from app.core.database_async import AsyncBase
@@ -17,6 +29,16 @@ class IngestionStatus(str, enum.Enum):
 
 class Document(AsyncBase):
     __tablename__ = "documents"
+    __table_args__ = (
+        # Serves status-filtered listings in created_at order
+        Index(
+            "ix_documents_ingestion_status_created_at",
+            "ingestion_status",
+            "created_at",
+        ),
+    )
+    # Fetch server-generated timestamps in the INSERT/UPDATE itself (RETURNING)
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String, nullable=False, index=True)
@@ -32,16 +54,18 @@ class Document(AsyncBase):
     )
     ingestion_error = Column(Text, nullable=True)
     uploaded_by = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    created_at = Column(DateTime, default=lambda: datetime.utcnow())
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
     updated_at = Column(
-        DateTime,
-        default=lambda: datetime.utcnow(),
-        onupdate=lambda: datetime.utcnow(),
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
     )
 
     @classmethod
     async def get(cls, db: AsyncSession, id: int) -> Optional["Document"]:
-        from sqlalchemy import select
         result = await db.execute(select(cls).filter(cls.id == id))
         return result.scalar_one_or_none()
 
@@ -49,11 +73,29 @@ class Document(AsyncBase):
     async def get_all(
         cls, db: AsyncSession, skip: int = 0, limit: int = 100, status: Optional[IngestionStatus] = None
     ) -> list["Document"]:
-        from sqlalchemy import select
-        query = select(cls)
+        """
+        Get documents with metadata columns only.
+        content and ingestion_error are not loaded; touching them raises.
+        """
+        query = select(cls).options(
+            load_only(
+                cls.id,
+                cls.filename,
+                cls.file_path,
+                cls.file_size,
+                cls.mime_type,
+                cls.ingestion_status,
+                cls.uploaded_by,
+                cls.created_at,
+                cls.updated_at,
+                raiseload=True,
+            )
+        )
         if status:
             query = query.filter(cls.ingestion_status == status)
-        result = await db.execute(query.offset(skip).limit(limit))
+        result = await db.execute(
+            query.order_by(cls.created_at.desc()).offset(skip).limit(limit)
+        )
         return list(result.scalars().all())
 
     @classmethod
@@ -61,7 +103,6 @@ class Document(AsyncBase):
         db_obj = cls(**kwargs)
         db.add(db_obj)
         await db.flush()  # Flush to get the ID without committing
-        await db.refresh(db_obj)
         return db_obj
 
     @classmethod
@@ -69,11 +110,26 @@ class Document(AsyncBase):
         """Update a document."""
         for key, value in kwargs.items():
             setattr(db_obj, key, value)
-        db_obj.updated_at = datetime.utcnow()
         await db.flush()  # Flush instead of commit (commit handled by dependency)
-        await db.refresh(db_obj)
         return db_obj
 
+    @classmethod
+    async def update_by_id(
+        cls, db: AsyncSession, id: int, **kwargs
+    ) -> Optional["Document"]:
+        """
+        Update a document by ID with a single UPDATE ... RETURNING statement.
+        Use update() instead when the instance is already loaded.
+        """
+        result = await db.execute(
+            sa_update(cls)
+            .where(cls.id == id)
+            .values(**kwargs)
+            .returning(cls)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
     @classmethod
     async def delete(cls, db: AsyncSession, db_obj: "Document") -> None:
         """Delete a document."""
@@ -83,6 +139,11 @@ class Document(AsyncBase):
 
 class Ingestion(AsyncBase):
     __tablename__ = "ingestions"
+    __table_args__ = (
+        # Serves "latest ingestion for a document" without a sort step
+        Index("ix_ingestions_document_id_created_at", "document_id", "created_at"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     document_id = Column(Integer, ForeignKey("documents.id"), nullable=False, index=True)
@@ -96,17 +157,19 @@ class Ingestion(AsyncBase):
     error_message = Column(Text, nullable=True)
     started_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=lambda: datetime.utcnow())
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
     updated_at = Column(
-        DateTime,
-        default=lambda: datetime.utcnow(),
-        onupdate=lambda: datetime.utcnow(),
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
     )
 
     @classmethod
     async def get(cls, db: AsyncSession, id: int) -> Optional["Ingestion"]:
         """Get an ingestion by ID."""
-        from sqlalchemy import select
         result = await db.execute(select(cls).filter(cls.id == id))
         return result.scalar_one_or_none()
 
@@ -115,13 +178,13 @@ class Ingestion(AsyncBase):
         cls, db: AsyncSession, document_id: int
     ) -> Optional["Ingestion"]:
         """Get the latest ingestion for a document."""
-        from sqlalchemy import select
         result = await db.execute(
             select(cls)
             .filter(cls.document_id == document_id)
             .order_by(cls.created_at.desc())
+            .limit(1)
         )
-        return result.scalar_one_or_none()
+        return result.scalars().first()
 
     @classmethod
     async def get_all(
@@ -132,11 +195,12 @@ class Ingestion(AsyncBase):
         status: Optional[IngestionStatus] = None,
     ) -> list["Ingestion"]:
         """Get all ingestions with optional status filter."""
-        from sqlalchemy import select
         query = select(cls)
         if status:
             query = query.filter(cls.status == status)
-        result = await db.execute(query.offset(skip).limit(limit).order_by(cls.created_at.desc()))
+        result = await db.execute(
+            query.order_by(cls.created_at.desc()).offset(skip).limit(limit)
+        )
         return list(result.scalars().all())
 
     @classmethod
@@ -145,7 +209,6 @@ class Ingestion(AsyncBase):
         db_obj = cls(**kwargs)
         db.add(db_obj)
         await db.flush()  # Flush to get the ID without committing
-        await db.refresh(db_obj)
         return db_obj
 
     @classmethod
@@ -153,7 +216,5 @@ class Ingestion(AsyncBase):
         """Update an ingestion."""
         for key, value in kwargs.items():
             setattr(db_obj, key, value)
-        db_obj.updated_at = datetime.utcnow()
         await db.flush()  # Flush instead of commit (commit handled by dependency)
-        await db.refresh(db_obj)
         return db_obj
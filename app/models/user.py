@@ -1,18 +1,20 @@
-from datetime import datetime, timezone
+import asyncio
 from typing import Optional
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, Integer, String, func
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.core.database import Base
-from app.core.security import get_password_hash, verify_password
-from app.schemas.user import UserCreate, UserUpdate
+from app.core.security import get_dummy_password_hash, verify_password
+from app.schemas.user import UserUpdate
 
 
 class User(Base):
     __tablename__ = "users"
+    # Fetch server-generated timestamps in the INSERT/UPDATE itself (RETURNING)
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
@@ -20,11 +22,12 @@ class User(Base):
     full_name = Column(String, index=True)
     is_active = Column(Boolean(), default=True)
     is_superuser = Column(Boolean(), default=False)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(
-        DateTime,
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
     )
 
     @classmethod
@@ -45,12 +48,21 @@ class User(Base):
         return user
 
     @classmethod
-    def create(cls, db: Session, obj_in: UserCreate) -> "User":
+    def create(
+        cls,
+        db: Session,
+        *,
+        email: str,
+        hashed_password: str,
+        full_name: str | None = None,
+        is_superuser: bool = False,
+    ) -> "User":
+        """Create a user. The password must already be hashed by the caller."""
         db_obj = cls(
-            email=obj_in.email,
-            hashed_password=get_password_hash(obj_in.password),
-            full_name=obj_in.full_name,
-            is_superuser=obj_in.is_superuser,
+            email=email,
+            hashed_password=hashed_password,
+            full_name=full_name,
+            is_superuser=is_superuser,
         )
         db.add(db_obj)
         db.commit()
@@ -58,11 +70,19 @@ class User(Base):
         return db_obj
 
     @classmethod
-    def update(cls, db: Session, db_obj: "User", obj_in: UserUpdate) -> "User":
-        update_data = obj_in.model_dump(exclude_unset=True)
-        if "password" in update_data:
-            hashed_password = get_password_hash(update_data["password"])
-            del update_data["password"]
+    def update(
+        cls,
+        db: Session,
+        db_obj: "User",
+        obj_in: UserUpdate,
+        hashed_password: str | None = None,
+    ) -> "User":
+        """
+        Update a user. A new password must be hashed by the caller and passed
+        as hashed_password; the plain obj_in.password is never stored.
+        """
+        update_data = obj_in.model_dump(exclude_unset=True, exclude={"password"})
+        if hashed_password:
             update_data["hashed_password"] = hashed_password
         for field in update_data:
             setattr(db_obj, field, update_data[field])
@@ -87,3 +107,44 @@ class User(Base):
         """Get a user by email (async)."""
         result = await db.execute(select(cls).filter(cls.email == email))
         return result.scalar_one_or_none()
+
+    @classmethod
+    async def create_async(
+        cls,
+        db: AsyncSession,
+        *,
+        email: str,
+        hashed_password: str,
+        full_name: str | None = None,
+        is_superuser: bool = False,
+    ) -> "User":
+        """Create a user (async). The password must already be hashed."""
+        db_obj = cls(
+            email=email,
+            hashed_password=hashed_password,
+            full_name=full_name,
+            is_superuser=is_superuser,
+        )
+        db.add(db_obj)
+        await db.flush()  # Flush to get the ID without committing
+        return db_obj
+
+    @classmethod
+    async def authenticate_async(
+        cls, db: AsyncSession, email: str, password: str
+    ) -> Optional["User"]:
+        """
+        Authenticate a user (async).
+        bcrypt runs in a worker thread so it doesn't block the event loop, and
+        unknown emails are checked against a dummy hash so that the response
+        time doesn't reveal which accounts exist.
+        """
+        user = await cls.get_by_email_async(db, email=email)
+        if user:
+            hashed_password = user.hashed_password
+        else:
+            hashed_password = await asyncio.to_thread(get_dummy_password_hash)
+        verified = await asyncio.to_thread(verify_password, password, hashed_password)
+        if not user or not verified:
+            return None
+        return user
@@ -20,11 +20,11 @@ class DocumentCreate(DocumentBase):
     uploaded_by: int
 
 
-class DocumentResponse(DocumentBase):
+class DocumentMetadataResponse(DocumentBase):
+    """Document without its (potentially large) extracted content."""
+
     id: int
-    content: Optional[str] = None
     ingestion_status: IngestionStatus
-    ingestion_error: Optional[str] = None
     uploaded_by: int
     created_at: datetime
     updated_at: datetime
@@ -33,6 +33,11 @@ class DocumentResponse(DocumentBase):
         from_attributes = True
 
 
+class DocumentResponse(DocumentMetadataResponse):
+    content: Optional[str] = None
+    ingestion_error: Optional[str] = None
+
+
 class IngestionResponse(BaseModel):
     id: int
     document_id: int
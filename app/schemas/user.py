@@ -3,6 +3,11 @@ from datetime import datetime
 
 from pydantic import BaseModel, EmailStr, field_validator
 
+# Password strength checks, compiled once at import
+_has_uppercase = re.compile(r"[A-Z]").search
+_has_lowercase = re.compile(r"[a-z]").search
+_has_digit = re.compile(r"\d").search
+
 
 class UserBase(BaseModel):
     email: EmailStr | None = None
@@ -25,11 +30,11 @@ class UserCreate(UserBase):
         # We allow up to 512 characters for very long passphrases
         if len(v) > 512:
             raise ValueError("Password must be less than 512 characters")
-        if not re.search(r"[A-Z]", v):
+        if not _has_uppercase(v):
             raise ValueError("Password must contain at least one uppercase letter")
-        if not re.search(r"[a-z]", v):
+        if not _has_lowercase(v):
             raise ValueError("Password must contain at least one lowercase letter")
-        if not re.search(r"\d", v):
+        if not _has_digit(v):
             raise ValueError("Password must contain at least one digit")
         # Optional: require special character
         # if not re.search(r'[!@#$%^&*(),.?":{}|<>]', v):
@@ -52,11 +57,11 @@ class UserUpdate(UserBase):
         # We allow up to 512 characters for very long passphrases
         if len(v) > 512:
             raise ValueError("Password must be less than 512 characters")
-        if not re.search(r"[A-Z]", v):
+        if not _has_uppercase(v):
             raise ValueError("Password must contain at least one uppercase letter")
-        if not re.search(r"[a-z]", v):
+        if not _has_lowercase(v):
             raise ValueError("Password must contain at least one lowercase letter")
-        if not re.search(r"\d", v):
+        if not _has_digit(v):
             raise ValueError("Password must contain at least one digit")
         return v
 
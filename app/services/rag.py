@@ -1,8 +1,7 @@
 import os
+import threading
+from functools import lru_cache
 from typing import List, Dict, Optional
-import chromadb
-from chromadb.config import Settings as ChromaSettings
-from sentence_transformers import SentenceTransformer
 import numpy as np
 
 from app.core.logging import get_logger
@@ -10,6 +9,11 @@ from config import settings
 
 logger = get_logger("rag")
 
+# Chunks are windows of the embedding model's own tokens, overlapping so a
+# sentence cut at one boundary is still whole in the neighbouring chunk
+CHUNK_TOKENS = 384
+CHUNK_OVERLAP_TOKENS = 48
+
 
 class RAGService:
 
@@ -19,21 +23,49 @@ class RAGService:
         self.embedding_model = None
         self.chroma_client = None
         self.collection = None
-        self._initialized = False
-        self._initialization_error = None
+        self._ready = False
+        self._init_lock = threading.Lock()
+        # Repeated searches (pagination, retries) skip the forward pass
+        self._encode_query = lru_cache(maxsize=1024)(self._encode_query_uncached)
 
     def _ensure_initialized(self):
-        if self._initialized:
-            if self._initialization_error:
-                raise RuntimeError(f"RAG service failed to initialize: {self._initialization_error}")
+        if self._ready:
             return
-
-        self._initialize()
-        self._initialized = True
+        # Concurrent first requests must not load the model twice; a failed
+        # initialization leaves _ready unset so the next call retries
+        with self._init_lock:
+            if not self._ready:
+                self._initialize()
+                self._ready = True
 
     def _initialize(self):
         logger.info(f"Loading embedding model: {self.embedding_model_name}")
+        # Heavy ML/vector-store imports are deferred until first use so that
+        # importing the app (e.g. in tests) doesn't load torch and chromadb
+        from sentence_transformers import SentenceTransformer
+
         self.embedding_model = SentenceTransformer(self.embedding_model_name)
+        self._ensure_fast_tokenizer()
+
+        import torch
+
+        if torch.cuda.is_available():
+            # Half precision halves memory traffic and uses tensor cores.
+            # encode() then returns float16 arrays, so callers cast back
+            self.embedding_model = self.embedding_model.to("cuda").half()
+
+        if settings.VECTOR_STORE == "faiss":
+            from app.services.vector_store_faiss import FaissCollection
+
+            self.collection = FaissCollection(
+                settings.FAISS_PERSIST_DIR,
+                dim=self.embedding_model.get_sentence_embedding_dimension(),
+            )
+            logger.info("RAG service initialized successfully (FAISS)")
+            return
+
+        import chromadb
+        from chromadb.config import Settings as ChromaSettings
 
         os.makedirs(self.persist_dir, exist_ok=True)
         
@@ -53,17 +85,99 @@ class RAGService:
         self.collection = self.chroma_client.get_or_create_collection(
             name="documents",
             metadata={
-                "hnsw:space": "cosine",
+                # Embeddings are L2-normalized, so inner product ranks like
+                # cosine without the per-comparison norm computation
+                "hnsw:space": "ip",
                 "ef_construction": 200
             },
         )
+        # Chroma ignores metadata for a collection that already exists, so an
+        # index built with another space keeps it. Cosine ranks normalized
+        # vectors exactly like "ip"; anything else needs a reindex.
+        space = (self.collection.metadata or {}).get("hnsw:space", "l2")
+        if space not in ("ip", "cosine"):
+            logger.warning(
+                f"Chroma collection 'documents' uses hnsw:space={space!r}, not "
+                "'ip'; search ranking will differ until it is rebuilt. Remove "
+                f"{self.persist_dir} and re-ingest documents (see README)."
+            )
         logger.info("RAG service initialized successfully")
 
+    def _ensure_fast_tokenizer(self):
+        # Rust tokenizers batch-encode without holding the GIL and provide the
+        # offset mappings _chunk_text relies on
+        if getattr(self.embedding_model.tokenizer, "is_fast", False):
+            return
+        try:
+            from transformers import AutoTokenizer
+
+            tokenizer = AutoTokenizer.from_pretrained(
+                self.embedding_model_name, use_fast=True
+            )
+        except Exception as e:
+            logger.warning(f"Fast tokenizer unavailable, using the slow one: {e}")
+            return
+        if tokenizer.is_fast:
+            self.embedding_model.tokenizer = tokenizer
+
     def generate_embeddings(self, texts: List[str]) -> np.ndarray:
         self._ensure_initialized()
         if not self.embedding_model:
             raise RuntimeError("Embedding model not initialized")
-        return self.embedding_model.encode(texts, show_progress_bar=False)
+        embeddings = self.embedding_model.encode(
+            texts,
+            batch_size=128,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        # The vector stores expect float32; a fp16 model yields float16
+        return embeddings.astype(np.float32, copy=False)
+
+    def _encode_query_uncached(self, query: str) -> tuple:
+        embedding = self.embedding_model.encode(
+            query,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        ).astype(np.float32, copy=False)
+        # Cached as an immutable tuple so callers can't corrupt shared entries
+        return tuple(embedding.tolist())
+
+    def generate_query_embedding(self, query: str) -> tuple:
+        self._ensure_initialized()
+        if not self.embedding_model:
+            raise RuntimeError("Embedding model not initialized")
+        return self._encode_query(query)
+
+    def _chunk_text(self, content: str) -> List[str]:
+        tokenizer = getattr(self.embedding_model, "tokenizer", None)
+        if tokenizer is None or not getattr(tokenizer, "is_fast", False):
+            # Offsets need a fast tokenizer; fall back to fixed character slabs
+            chunk_size = 1000
+            return [
+                content[i : i + chunk_size] for i in range(0, len(content), chunk_size)
+            ]
+
+        # Leave room for the special tokens the model adds around each chunk
+        window = min(CHUNK_TOKENS, self.embedding_model.max_seq_length - 2)
+        stride = max(window - CHUNK_OVERLAP_TOKENS, 1)
+        offsets = tokenizer(
+            content,
+            add_special_tokens=False,
+            return_offsets_mapping=True,
+            verbose=False,
+        )["offset_mapping"]
+
+        # Slice the original text by character offsets rather than decoding
+        # token ids, so chunks keep their exact casing and whitespace
+        chunks = []
+        for start in range(0, len(offsets), stride):
+            span = offsets[start : start + window]
+            chunks.append(content[span[0][0] : span[-1][1]])
+            if start + window >= len(offsets):
+                break
+        return chunks
 
     def add_document(
         self, document_id: int, content: str, metadata: Optional[Dict] = None
@@ -74,26 +188,18 @@ class RAGService:
             logger.warning(f"Empty content for document {document_id}, skipping")
             return
 
-        chunk_size = 1000
-        chunks = [
-            content[i : i + chunk_size] for i in range(0, len(content), chunk_size)
-        ]
-
+        chunks = self._chunk_text(content)
         if not chunks:
             return
 
         embeddings = self.generate_embeddings(chunks)
 
-        metadatas = []
-        ids = []
-        for i, chunk in enumerate(chunks):
-            chunk_metadata = {
-                "document_id": str(document_id),
-                "chunk_index": str(i),
-                **(metadata or {}),
-            }
-            metadatas.append(chunk_metadata)
-            ids.append(f"doc_{document_id}_chunk_{i}")
+        # Built once; caller metadata still takes precedence over our keys
+        base_metadata = {"document_id": str(document_id), **(metadata or {})}
+        metadatas = [
+            {"chunk_index": str(i), **base_metadata} for i in range(len(chunks))
+        ]
+        ids = [f"doc_{document_id}_chunk_{i}" for i in range(len(chunks))]
 
         self.collection.add(
             embeddings=embeddings.tolist(),
@@ -111,14 +217,14 @@ class RAGService:
         if not query or not query.strip():
             return []
 
-        query_embedding = self.generate_embeddings([query])[0]
+        query_embedding = self.generate_query_embedding(query)
 
         where = None
         if document_ids:
             where = {"document_id": {"$in": [str(doc_id) for doc_id in document_ids]}}
 
         results = self.collection.query(
-            query_embeddings=[query_embedding.tolist()],
+            query_embeddings=[list(query_embedding)],
             n_results=n_results,
             where=where,
         )
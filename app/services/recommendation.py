@@ -2,27 +2,106 @@
 Book Recommendation Service
 """
 
+import itertools
+import time
+from collections import OrderedDict
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
+from sqlalchemy.orm import raiseload
 
 from app.core.logging import get_logger
-from app.models.book import Book, Review
+from app.models.book import Book, BookStats, Review
 from app.schemas.book import BookResponse
 
 logger = get_logger("recommendations")
 
+# Recommendations rarely change minute to minute, so each process caches them
+RECOMMENDATION_CACHE_TTL = 60
+RECOMMENDATION_CACHE_MAX_SIZE = 1024
+
 
 class RecommendationService:
     """Service for generating book recommendations."""
 
-    @staticmethod
+    def __init__(self):
+        self._cache: OrderedDict[tuple, tuple[float, List[BookResponse], str]] = (
+            OrderedDict()
+        )
+        # Bumped when a user's reviews change so their cached entries stop
+        # matching; maps user_id to (bumped_at, version), oldest bump first
+        self._user_versions: OrderedDict[int, tuple[float, int]] = OrderedDict()
+        # Versions are never reused, so a pruned user can't match old entries
+        self._next_version = itertools.count(1)
+
+    def _user_version(self, user_id: Optional[int]) -> int:
+        entry = self._user_versions.get(user_id)
+        return entry[1] if entry else 0
+
+    def invalidate_user(self, user_id: int) -> None:
+        """
+        Drop cached recommendations for a user (e.g. after they review a book).
+        Call after the change is committed, or a concurrent request can cache
+        the old state under the new version.
+        """
+        now = time.monotonic()
+        self._user_versions[user_id] = (now, next(self._next_version))
+        self._user_versions.move_to_end(user_id)
+
+        # Bounded like the result cache. A bump older than the TTL only guards
+        # entries that have expired anyway; one evicted earlier for size also
+        # takes the user's cached entries with it
+        while self._user_versions:
+            oldest_id, (bumped_at, _) = next(iter(self._user_versions.items()))
+            expired = now - bumped_at >= RECOMMENDATION_CACHE_TTL
+            full = len(self._user_versions) > RECOMMENDATION_CACHE_MAX_SIZE
+            if not expired and not full:
+                break
+            self._user_versions.popitem(last=False)
+            if not expired:
+                for key in [key for key in self._cache if key[0] == oldest_id]:
+                    del self._cache[key]
+
     async def get_recommendations(
+        self,
         db: AsyncSession,
         user_id: Optional[int] = None,
         genre: Optional[str] = None,
         limit: int = 10,
-    ) -> tuple[List[Book], str]:
+    ) -> tuple[List[BookResponse], str]:
+        """
+        Get book recommendations, served from a short-lived per-process cache
+        keyed by (user_id, genre, limit).
+        """
+        key = (user_id, genre, limit, self._user_version(user_id))
+        now = time.monotonic()
+        cached = self._cache.get(key)
+        if cached and now - cached[0] < RECOMMENDATION_CACHE_TTL:
+            self._cache.move_to_end(key)
+            return list(cached[1]), cached[2]
+
+        books, reason, is_fallback = await self._get_recommendations(
+            db, user_id=user_id, genre=genre, limit=limit
+        )
+        # Cache response models, not ORM instances bound to this request's session
+        responses = [BookResponse.model_validate(book) for book in books]
+        if is_fallback:
+            # Fallbacks stand in for missing data or a failed query; serving
+            # them for the whole TTL would hide better results once available
+            return responses, reason
+        self._cache[key] = (now, responses, reason)
+        self._cache.move_to_end(key)
+        if len(self._cache) > RECOMMENDATION_CACHE_MAX_SIZE:
+            self._cache.popitem(last=False)
+        return list(responses), reason
+
+    @staticmethod
+    async def _get_recommendations(
+        db: AsyncSession,
+        user_id: Optional[int] = None,
+        genre: Optional[str] = None,
+        limit: int = 10,
+    ) -> tuple[List[Book], str, bool]:
         """
         Get book recommendations based on user preferences.
 
@@ -33,79 +112,81 @@ class RecommendationService:
             limit: Maximum number of recommendations
 
         Returns:
-            Tuple of (list of books, reason string)
+            Tuple of (list of books, reason string, whether the recent-books
+            fallback was used). Books are loaded without relationships;
+            touching book.reviews raises.
         """
         try:
             # Strategy 1: If user_id provided, recommend based on their review history
             if user_id:
-                # Get user's reviewed books and their ratings
-                user_reviews_query = select(Review).filter(Review.user_id == user_id)
-                user_reviews_result = await db.execute(user_reviews_query)
-                user_reviews = list(user_reviews_result.scalars().all())
-
-                if user_reviews:
-                    # Get genres of highly rated books
-                    highly_rated_book_ids = [
-                        r.book_id for r in user_reviews if r.rating >= 4
-                    ]
-                    if highly_rated_book_ids:
-                        # Get books in similar genres
-                        similar_books_query = (
-                            select(Book)
-                            .filter(Book.id.notin_(highly_rated_book_ids))
-                            .limit(limit)
-                        )
-                        if genre:
-                            similar_books_query = similar_books_query.filter(
-                                Book.genre == genre
-                            )
-                        result = await db.execute(similar_books_query)
-                        books = list(result.scalars().all())
-                        if books:
-                            return (
-                                books,
-                                f"Based on your highly rated books in similar genres",
-                            )
-
-            # Strategy 2: Recommend highly rated books
-            # Get average ratings for all books
-            avg_ratings_query = (
-                select(
-                    Review.book_id,
-                    func.avg(Review.rating).label("avg_rating"),
-                    func.count(Review.id).label("review_count"),
+                # Genres of the user's highly rated books, resolved in the same query
+                liked_genres = (
+                    select(Book.genre)
+                    .join(Review, Review.book_id == Book.id)
+                    .where(Review.user_id == user_id, Review.rating >= 4)
+                    .distinct()
+                    .cte("liked_genres")
+                )
+                reviewed_book_ids = select(Review.book_id).where(
+                    Review.user_id == user_id
+                )
+                # Unread books in similar genres
+                similar_books_query = (
+                    select(Book)
+                    .options(raiseload("*"))
+                    .where(Book.genre.in_(select(liked_genres.c.genre)))
+                    .where(Book.id.notin_(reviewed_book_ids))
+                    .limit(limit)
                 )
-                .group_by(Review.book_id)
-                .having(func.count(Review.id) >= 3)  # At least 3 reviews
-                .order_by(func.avg(Review.rating).desc())
-                .limit(limit)
-            )
-            avg_ratings_result = await db.execute(avg_ratings_query)
-            top_rated_book_ids = [
-                row.book_id for row in avg_ratings_result.fetchall()
-            ]
-
-            if top_rated_book_ids:
-                books_query = select(Book).filter(Book.id.in_(top_rated_book_ids))
                 if genre:
-                    books_query = books_query.filter(Book.genre == genre)
-                result = await db.execute(books_query)
+                    similar_books_query = similar_books_query.filter(
+                        Book.genre == genre
+                    )
+                result = await db.execute(similar_books_query)
                 books = list(result.scalars().all())
                 if books:
                     return (
                         books,
-                        "Highly rated books with at least 3 reviews",
+                        "Based on your highly rated books in similar genres",
+                        False,
                     )
 
+            # Strategy 2: Recommend highly rated books
+            # book_stats is maintained on review insert, so this is an index
+            # scan over ix_book_stats_top_rated rather than an aggregate
+            books_query = (
+                select(Book)
+                .options(raiseload("*"))
+                .join(BookStats, BookStats.book_id == Book.id)
+                .where(BookStats.review_count >= 3)  # At least 3 reviews
+                .order_by(BookStats.avg_rating.desc())
+                .limit(limit)
+            )
+            if genre:
+                books_query = books_query.filter(Book.genre == genre)
+            result = await db.execute(books_query)
+            books = list(result.scalars().all())
+            if books:
+                return (
+                    books,
+                    "Highly rated books with at least 3 reviews",
+                    False,
+                )
+
             # Strategy 3: Fallback - recent books in genre or all recent books
-            books_query = select(Book).order_by(Book.created_at.desc()).limit(limit)
+            books_query = (
+                select(Book)
+                .options(raiseload("*"))
+                .order_by(Book.created_at.desc())
+                .limit(limit)
+            )
             if genre:
                 books_query = books_query.filter(Book.genre == genre)
             result = await db.execute(books_query)
             books = list(result.scalars().all())
 
             reason = f"Recent books" + (f" in {genre} genre" if genre else "")
-            return books, reason
+            return books, reason, True
 
         except Exception as e:
             logger.exception(
@@ -114,12 +195,17 @@ class RecommendationService:
                 context={"user_id": user_id, "genre": genre, "limit": limit},
             )
             # Fallback to recent books
-            books_query = select(Book).order_by(Book.created_at.desc()).limit(limit)
+            books_query = (
+                select(Book)
+                .options(raiseload("*"))
+                .order_by(Book.created_at.desc())
+                .limit(limit)
+            )
             if genre:
                 books_query = books_query.filter(Book.genre == genre)
             result = await db.execute(books_query)
             books = list(result.scalars().all())
-            return books, "Recent books (fallback)"
+            return books, "Recent books (fallback)", True
 
 
 # Singleton instance
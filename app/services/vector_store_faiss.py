@@ -0,0 +1,262 @@
+"""
+FAISS Vector Store
+
+Drop-in replacement for the part of the ChromaDB collection API that
+RAGService uses (add/query/get/delete). Vectors live in an HNSW index saved
+with faiss.write_index; chunk text and metadata live in a SQLite table.
+
+The index file is always written before SQLite commits, so after a crash the
+index may hold vectors that have no row but never the reverse. Vectors
+without a row are tombstones: searches skip them and compaction drops them.
+
+Requires the optional "faiss" extra. The index is held in process memory,
+so run a single writer process per persist directory.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+# Rebuild the index once this share of its vectors are tombstones
+COMPACT_DEAD_RATIO = 0.25
+
+
+class FaissCollection:
+    """HNSW inner-product index over L2-normalized embeddings."""
+
+    def __init__(self, persist_dir: str, dim: int):
+        try:
+            import faiss
+        except ImportError as e:
+            raise RuntimeError(
+                "VECTOR_STORE=faiss requires faiss-cpu (pip install '.[faiss]')"
+            ) from e
+
+        self._faiss = faiss
+        self._lock = threading.Lock()
+        os.makedirs(persist_dir, exist_ok=True)
+        self.index_path = os.path.join(persist_dir, "faiss.index")
+
+        self.db = sqlite3.connect(
+            os.path.join(persist_dir, "faiss_meta.sqlite3"), check_same_thread=False
+        )
+        # Row ids are assigned here rather than by SQLite so they can be
+        # added to the index before the rows are committed
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS chunks ("
+            "id INTEGER PRIMARY KEY, "
+            "chunk_id TEXT UNIQUE NOT NULL, "
+            "document_id TEXT, "
+            "document TEXT, "
+            "metadata TEXT NOT NULL)"
+        )
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS ix_chunks_document_id ON chunks (document_id)"
+        )
+        self.db.commit()
+
+        if os.path.exists(self.index_path):
+            self.index = faiss.read_index(self.index_path)
+        else:
+            self.index = self._new_index(dim)
+        self._reconcile()
+
+    def _new_index(self, dim: int):
+        hnsw = self._faiss.IndexHNSWFlat(dim, HNSW_M, self._faiss.METRIC_INNER_PRODUCT)
+        hnsw.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        # IDMap2 maps FAISS ids to chunks rows and can reconstruct vectors
+        return self._faiss.IndexIDMap2(hnsw)
+
+    def _index_ids(self) -> np.ndarray:
+        return self._faiss.vector_to_array(self.index.id_map)
+
+    def _reconcile(self):
+        index_ids = set(self._index_ids().tolist())
+        row_ids = {row[0] for row in self.db.execute("SELECT id FROM chunks")}
+
+        # Rows whose vectors never reached the index can't be searched
+        missing = list(row_ids - index_ids)
+        if missing:
+            self._delete_rows(missing)
+
+        self._dead = index_ids - row_ids
+        self._next_id = max(index_ids | row_ids, default=0) + 1
+
+    def _save(self):
+        tmp_path = f"{self.index_path}.tmp"
+        self._faiss.write_index(self.index, tmp_path)
+        os.replace(tmp_path, self.index_path)
+
+    @staticmethod
+    def _where_document_ids(where: dict) -> list[str]:
+        condition = where.get("document_id")
+        if condition is None or len(where) != 1:
+            raise ValueError(f"Unsupported filter: {where}")
+        if isinstance(condition, dict):
+            return [str(doc_id) for doc_id in condition["$in"]]
+        return [str(condition)]
+
+    def _row_ids(self, column: str, values: list[str]) -> list[int]:
+        placeholders = ",".join("?" * len(values))
+        rows = self.db.execute(
+            f"SELECT id FROM chunks WHERE {column} IN ({placeholders})", values
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def _delete_rows(self, row_ids: list[int]):
+        placeholders = ",".join("?" * len(row_ids))
+        self.db.execute(f"DELETE FROM chunks WHERE id IN ({placeholders})", row_ids)
+        self.db.commit()
+
+    def _maybe_compact(self):
+        """
+        HNSW graphs can't drop nodes, so deleted vectors stay in the index as
+        tombstones until enough pile up to rebuild it from the live ones.
+        """
+        if len(self._dead) <= COMPACT_DEAD_RATIO * self.index.ntotal:
+            return
+        index_ids = self._index_ids()
+        live_ids = index_ids[~np.isin(index_ids, list(self._dead))]
+        index = self._new_index(self.index.d)
+        if len(live_ids):
+            index.add_with_ids(self.index.reconstruct_batch(live_ids), live_ids)
+        self.index = index
+        self._save()
+        self._dead.clear()
+
+    def add(
+        self,
+        embeddings,
+        documents: list[str],
+        metadatas: list[dict],
+        ids: list[str],
+    ):
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        with self._lock:
+            row_ids = np.arange(
+                self._next_id, self._next_id + len(ids), dtype=np.int64
+            )
+            self._next_id += len(ids)
+            self.index.add_with_ids(vectors, row_ids)
+            self._save()
+
+            # Re-adding a chunk replaces it; the old vectors become tombstones
+            replaced = self._row_ids("chunk_id", ids)
+            try:
+                if replaced:
+                    placeholders = ",".join("?" * len(replaced))
+                    self.db.execute(
+                        f"DELETE FROM chunks WHERE id IN ({placeholders})", replaced
+                    )
+                self.db.executemany(
+                    "INSERT INTO chunks "
+                    "(id, chunk_id, document_id, document, metadata) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (
+                            row_id,
+                            chunk_id,
+                            metadata.get("document_id"),
+                            document,
+                            json.dumps(metadata),
+                        )
+                        for row_id, chunk_id, document, metadata in zip(
+                            row_ids.tolist(), ids, documents, metadatas, strict=True
+                        )
+                    ],
+                )
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                self._dead.update(row_ids.tolist())
+                raise
+            self._dead.update(replaced)
+            self._maybe_compact()
+
+    def query(
+        self,
+        query_embeddings,
+        n_results: int = 10,
+        where: dict | None = None,
+    ) -> dict[str, list[list]]:
+        vectors = np.asarray(query_embeddings, dtype=np.float32)
+        empty = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+
+        params = self._faiss.SearchParametersHNSW()
+        params.efSearch = max(HNSW_EF_SEARCH, n_results)
+        with self._lock:
+            # Filter inside the graph walk rather than over-fetching. The
+            # selector only borrows the id array and the wrapped selector, so
+            # both are kept referenced until the search is done
+            if where:
+                selected = np.asarray(
+                    self._row_ids("document_id", self._where_document_ids(where)),
+                    dtype=np.int64,
+                )
+                if not len(selected):
+                    return empty
+                batch = self._faiss.IDSelectorBatch(
+                    len(selected), self._faiss.swig_ptr(selected)
+                )
+                params.sel = batch
+            elif self._dead:
+                selected = np.fromiter(self._dead, dtype=np.int64)
+                batch = self._faiss.IDSelectorBatch(
+                    len(selected), self._faiss.swig_ptr(selected)
+                )
+                params.sel = self._faiss.IDSelectorNot(batch)
+            scores, labels = self.index.search(vectors, n_results, params=params)
+
+            found = [int(label) for label in labels.ravel() if label != -1]
+            rows = {}
+            if found:
+                placeholders = ",".join("?" * len(found))
+                rows = {
+                    row[0]: row[1:]
+                    for row in self.db.execute(
+                        "SELECT id, chunk_id, document, metadata FROM chunks "
+                        f"WHERE id IN ({placeholders})",
+                        found,
+                    )
+                }
+
+        results = {key: [] for key in empty}
+        for query_scores, query_labels in zip(scores, labels, strict=True):
+            hits = [
+                (rows[int(label)], float(score))
+                for score, label in zip(query_scores, query_labels, strict=True)
+                if int(label) in rows
+            ]
+            results["ids"].append([row[0] for row, _ in hits])
+            results["documents"].append([row[1] for row, _ in hits])
+            results["metadatas"].append([json.loads(row[2]) for row, _ in hits])
+            # Same convention as Chroma's "ip" space: 1 - inner product
+            results["distances"].append([1.0 - score for _, score in hits])
+        return results
+
+    def get(self, where: dict) -> dict[str, list]:
+        document_ids = self._where_document_ids(where)
+        placeholders = ",".join("?" * len(document_ids))
+        with self._lock:
+            rows = self.db.execute(
+                f"SELECT chunk_id FROM chunks WHERE document_id IN ({placeholders})",
+                document_ids,
+            ).fetchall()
+        return {"ids": [row[0] for row in rows]}
+
+    def delete(self, ids: list[str]):
+        with self._lock:
+            row_ids = self._row_ids("chunk_id", ids)
+            if row_ids:
+                # Nothing is written to the index; reopening finds the
+                # vectors without rows and treats them as tombstones again
+                self._delete_rows(row_ids)
+                self._dead.update(row_ids)
+                self._maybe_compact()
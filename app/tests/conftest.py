@@ -2,26 +2,61 @@
 Pytest configuration and fixtures
 """
 
-import pytest
 import asyncio
-from httpx import AsyncClient
+import os
+from contextlib import contextmanager
+
+# Must be set before the app (and its settings) are imported
+os.environ.setdefault("APP_ENV", "testing")
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from passlib.context import CryptContext
+from sqlalchemy import delete, event, insert
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.pool import NullPool
 
 from app.core.database_async import AsyncBase, get_async_db
+from app.models.book import Book, BookStats
 from app.models.user import User
+from app.core import security
 from app.core.security import get_password_hash
 from app import app
+from config import settings
+
+
+# Create test database engine. By default a named shared-cache in-memory
+# database lets every connection see the same data without pinning them all to
+# one connection; each pytest-xdist worker gets its own database. Set
+# TEST_DATABASE_URL to run against another database.
+TEST_DATABASE_URL = os.environ.get(
+    "TEST_DATABASE_URL",
+    "sqlite+aiosqlite:///file:memdb_"
+    f"{os.environ.get('PYTEST_XDIST_WORKER', 'main')}"
+    "?mode=memory&cache=shared&uri=true",
+)
 
+# No pooling: connections are closed as soon as a session is done with them
+test_engine = create_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
 
-# Create test database engine
-TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+if test_engine.dialect.name == "sqlite":
+    # pysqlite's own transaction handling breaks SAVEPOINTs; take it over so
+    # each test can run inside an outer transaction rolled back afterwards
+    @event.listens_for(test_engine.sync_engine, "connect")
+    def _configure_sqlite_connection(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        # Nothing here needs to survive a crash
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.close()
+
+    @event.listens_for(test_engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
 
-test_engine = create_async_engine(
-    TEST_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
 
 TestSessionLocal = async_sessionmaker(
     test_engine, class_=AsyncSession, expire_on_commit=False
@@ -29,73 +64,185 @@ TestSessionLocal = async_sessionmaker(
 
 
 @pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+def event_loop_policy():
+    """Run the suite on uvloop when it's installed (it isn't on Windows)."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
+_MISSING = object()
+
+
+@contextmanager
+def override_dependency(dependency, override):
+    """
+    Override one app dependency, restoring whatever was installed before
+    (including another fixture's override) on exit.
+    """
+    previous = app.dependency_overrides.get(dependency, _MISSING)
+    app.dependency_overrides[dependency] = override
+    try:
+        yield
+    finally:
+        if previous is _MISSING:
+            app.dependency_overrides.pop(dependency, None)
+        else:
+            app.dependency_overrides[dependency] = previous
+
+
+def pytest_collection_modifyitems(items):
+    """
+    Run every async test in the session event loop, the same loop the
+    session-scoped fixtures (engine, schema) were created on.
+    """
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if pytest_asyncio.is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fast_password_hashing():
+    """
+    Swap bcrypt for passlib's plaintext scheme while testing. Tests don't
+    exercise hash strength, and every bcrypt round costs ~100ms+.
+    """
+    if settings.APP_ENV != "testing":
+        yield
+        return
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(security, "pwd_context", CryptContext(schemes=["plaintext"]))
+        security.get_dummy_password_hash.cache_clear()
+        yield
+    security.get_dummy_password_hash.cache_clear()
 
 
-@pytest.fixture(scope="function")
-async def db():
-    """Create a test database session."""
-    async with test_engine.begin() as conn:
+@pytest.fixture(scope="session")
+async def _conn():
+    """
+    One connection for the whole test session: it creates the schema once and
+    then hosts every test's transaction, so the per-test path runs no DDL and
+    opens no connections. It also keeps the shared-cache memory database
+    alive, since SQLite drops it when its last connection closes. The schema
+    is dropped at teardown so a persistent TEST_DATABASE_URL starts clean.
+    """
+    async with test_engine.connect() as conn:
         await conn.run_sync(AsyncBase.metadata.create_all)
-    
-    async with TestSessionLocal() as session:
-        yield session
-    
-    async with test_engine.begin() as conn:
+        await conn.commit()
+        yield conn
+        await conn.rollback()
         await conn.run_sync(AsyncBase.metadata.drop_all)
+        await conn.commit()
+    await test_engine.dispose()
 
 
 @pytest.fixture(scope="function")
-async def client(db: AsyncSession):
-    """Create a test client."""
-    async def override_get_db():
-        yield db
-    
-    app.dependency_overrides[get_async_db] = override_get_db
-    
-    async with AsyncClient(app=app, base_url="http://test") as ac:
+async def db(_conn):
+    """
+    Create a test database session. Each test runs inside a transaction that
+    is rolled back afterwards; commits made by the test only release a SAVEPOINT.
+    """
+    transaction = await _conn.begin()
+    session = TestSessionLocal(bind=_conn, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        await session.close()
+        await transaction.rollback()
+
+
+@pytest.fixture(scope="function")
+async def book_factory(db: AsyncSession):
+    """
+    Create books inside the test's transaction. Rows are only flushed, so the
+    rollback at teardown removes them without any commit.
+    """
+    async def make(**overrides) -> Book:
+        book = Book(
+            **{
+                "title": "Test Book",
+                "author": "Test Author",
+                "genre": "Fiction",
+                "year_published": 2024,
+                **overrides,
+            },
+            # Seeded like Book.create, so reviews take the same stats path
+            stats=BookStats(),
+        )
+        db.add(book)
+        await db.flush()
+        return book
+
+    return make
+
+
+@pytest.fixture(scope="session")
+async def http_client():
+    """One ASGI transport and client shared by the whole test session."""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
-    
-    app.dependency_overrides.clear()
 
 
 @pytest.fixture(scope="function")
-async def test_user(db: AsyncSession):
-    """Create a test user."""
-    from sqlalchemy import select
-    # Check if user already exists
-    result = await db.execute(select(User).filter(User.email == "test@example.com"))
-    existing_user = result.scalar_one_or_none()
-    if existing_user:
-        return existing_user
-    
-    user = User(
-        email="test@example.com",
-        hashed_password=get_password_hash("testpassword"),
-        full_name="Test User",
-        is_active=True,
-        is_superuser=False,
+async def client(http_client: AsyncClient, db: AsyncSession):
+    """Create a test client whose requests use this test's database session."""
+    async def override_get_db():
+        yield db
+
+    with override_dependency(get_async_db, override_get_db):
+        yield http_client
+
+
+@pytest.fixture(scope="session")
+async def test_user(_conn):
+    """
+    Create the test user once, committed outside the per-test transactions
+    so every test sees the same row and no rollback removes it. The row is
+    written with a Core INSERT on the session connection (no ORM flush) and
+    returned as a detached User. Any row left by an interrupted run against
+    a persistent database is replaced first.
+    """
+    fields = {
+        "email": "test@example.com",
+        "hashed_password": get_password_hash("testpassword"),
+        "full_name": "Test User",
+        "is_active": True,
+        "is_superuser": False,
+    }
+    await _conn.execute(
+        delete(User.__table__).where(User.__table__.c.email == fields["email"])
+    )
+    result = await _conn.execute(
+        insert(User.__table__).values(**fields).returning(User.__table__.c.id)
     )
-    db.add(user)
-    await db.commit()
-    await db.refresh(user)
+    user_id = result.scalar_one()
+    # The one commit this row needs; per-test transactions never commit
+    await _conn.commit()
+
+    user = User(id=user_id, **fields)
+    make_transient_to_detached(user)
     return user
 
 
-@pytest.fixture(scope="function")
-async def auth_headers(client: AsyncClient, test_user: User):
-    """Get authentication headers."""
-    # Login to get token
-    response = await client.post(
-        "/api/v1/auth/login",
-        data={
-            "username": test_user.email,
-            "password": "testpassword",
-        },
-    )
+@pytest.fixture(scope="session")
+async def auth_headers(http_client: AsyncClient, test_user: User):
+    """Log in once and reuse the bearer token for the whole session."""
+    async def override_get_db():
+        async with TestSessionLocal() as session:
+            yield session
+
+    with override_dependency(get_async_db, override_get_db):
+        response = await http_client.post(
+            "/api/v1/auth/login",
+            data={
+                "username": test_user.email,
+                "password": "testpassword",
+            },
+        )
     token = response.json()["access_token"]
     return {"Authorization": f"Bearer {token}"}
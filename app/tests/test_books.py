@@ -4,9 +4,10 @@ Unit tests for Book API
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.book import Book
+from app.models.book import Book, BookStats, Review
 from app.models.user import User
 
 
@@ -40,16 +41,10 @@ async def test_get_books(client: AsyncClient, auth_headers: dict):
 
 
 @pytest.mark.asyncio
-async def test_get_book_by_id(client: AsyncClient, auth_headers: dict, db: AsyncSession):
+async def test_get_book_by_id(client: AsyncClient, auth_headers: dict, book_factory):
     """Test getting a book by ID."""
     # Create a book first
-    book = await Book.create(
-        db,
-        title="Test Book",
-        author="Test Author",
-        genre="Fiction",
-        year_published=2024,
-    )
+    book = await book_factory()
     
     response = await client.get(
         f"/api/v1/books/{book.id}",
@@ -62,15 +57,9 @@ async def test_get_book_by_id(client: AsyncClient, auth_headers: dict, db: Async
 
 
 @pytest.mark.asyncio
-async def test_update_book(client: AsyncClient, auth_headers: dict, db: AsyncSession):
+async def test_update_book(client: AsyncClient, auth_headers: dict, book_factory):
     """Test updating a book."""
-    book = await Book.create(
-        db,
-        title="Test Book",
-        author="Test Author",
-        genre="Fiction",
-        year_published=2024,
-    )
+    book = await book_factory()
     
     update_data = {"title": "Updated Book Title"}
     response = await client.put(
@@ -84,15 +73,9 @@ async def test_update_book(client: AsyncClient, auth_headers: dict, db: AsyncSes
 
 
 @pytest.mark.asyncio
-async def test_delete_book(client: AsyncClient, auth_headers: dict, db: AsyncSession):
+async def test_delete_book(client: AsyncClient, auth_headers: dict, book_factory):
     """Test deleting a book."""
-    book = await Book.create(
-        db,
-        title="Test Book",
-        author="Test Author",
-        genre="Fiction",
-        year_published=2024,
-    )
+    book = await book_factory()
     
     response = await client.delete(
         f"/api/v1/books/{book.id}",
@@ -102,15 +85,9 @@ async def test_delete_book(client: AsyncClient, auth_headers: dict, db: AsyncSes
 
 
 @pytest.mark.asyncio
-async def test_create_review(client: AsyncClient, auth_headers: dict, db: AsyncSession):
+async def test_create_review(client: AsyncClient, auth_headers: dict, book_factory):
     """Test creating a review."""
-    book = await Book.create(
-        db,
-        title="Test Book",
-        author="Test Author",
-        genre="Fiction",
-        year_published=2024,
-    )
+    book = await book_factory()
     
     review_data = {
         "book_id": book.id,
@@ -126,3 +103,49 @@ async def test_create_review(client: AsyncClient, auth_headers: dict, db: AsyncS
     data = response.json()
     assert data["review_text"] == "Great book!"
     assert data["rating"] == 5
+
+
+@pytest.mark.asyncio
+async def test_get_book_summary(
+    client: AsyncClient,
+    auth_headers: dict,
+    db: AsyncSession,
+    book_factory,
+    test_user: User,
+):
+    """Test the aggregated rating summary for a book."""
+    book = await book_factory()
+    for rating in (4, 5):
+        await Review.create(
+            db, book_id=book.id, user_id=test_user.id, review_text="Good", rating=rating
+        )
+
+    response = await client.get(
+        f"/api/v1/books/{book.id}/summary",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["average_rating"] == 4.5
+    assert data["total_reviews"] == 2
+
+
+@pytest.mark.asyncio
+async def test_review_upserts_book_stats(db: AsyncSession, test_user: User):
+    """Test that reviews keep book_stats current, even for books without a row."""
+    # Inserted without the stats row Book.create seeds
+    book = Book(title="Legacy", author="Author", genre="Fiction", year_published=2000)
+    db.add(book)
+    await db.flush()
+
+    for rating in (3, 5):
+        await Review.create(
+            db, book_id=book.id, user_id=test_user.id, review_text="Ok", rating=rating
+        )
+
+    result = await db.execute(
+        select(BookStats.review_count, BookStats.avg_rating).filter(
+            BookStats.book_id == book.id
+        )
+    )
+    assert result.one() == (2, 4.0)
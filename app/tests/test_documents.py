@@ -7,6 +7,7 @@ from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.document import Document, IngestionStatus
+from app.models.user import User
 
 
 @pytest.mark.asyncio
@@ -36,24 +37,26 @@ async def test_get_documents(client: AsyncClient, auth_headers: dict):
 
 
 @pytest.mark.asyncio
-async def test_get_document_by_id(client: AsyncClient, auth_headers: dict, db: AsyncSession):
+async def test_get_documents_omits_content(client: AsyncClient, auth_headers: dict):
+    """Test that the document list only returns metadata."""
+    files = {
+        "file": ("test.txt", b"Test document content", "text/plain")
+    }
+    await client.post("/api/v1/documents", files=files, headers=auth_headers)
+
+    response = await client.get("/api/v1/documents", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data
+    assert "content" not in data[0]
+    assert data[0]["filename"] == "test.txt"
+
+
+@pytest.mark.asyncio
+async def test_get_document_by_id(
+    client: AsyncClient, auth_headers: dict, db: AsyncSession, test_user: User
+):
     """Test getting a document by ID."""
-    from app.models.user import User
-    from sqlalchemy import select
-    
-    # Get or create a test user
-    result = await db.execute(select(User).limit(1))
-    user = result.scalar_one_or_none()
-    if not user:
-        user = User(
-            email="test@example.com",
-            hashed_password="hashed",
-            is_active=True,
-        )
-        db.add(user)
-        await db.commit()
-        await db.refresh(user)
-    
     document = await Document.create(
         db,
         filename="test.txt",
@@ -61,9 +64,9 @@ async def test_get_document_by_id(client: AsyncClient, auth_headers: dict, db: A
         file_size=100,
         mime_type="text/plain",
         ingestion_status=IngestionStatus.PENDING,
-        uploaded_by=user.id,
+        uploaded_by=test_user.id,
     )
-    
+
     response = await client.get(
         f"/api/v1/documents/{document.id}",
         headers=auth_headers,
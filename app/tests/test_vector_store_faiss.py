@@ -0,0 +1,156 @@
+"""
+Unit tests for the FAISS vector store
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+
+from app.services.vector_store_faiss import FaissCollection  # noqa: E402
+
+DIM = 16
+
+
+def _vectors(count: int, seed: int = 0) -> np.ndarray:
+    vectors = np.random.default_rng(seed).standard_normal((count, DIM))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(
+        np.float32
+    )
+
+
+def _add_document(store: FaissCollection, document_id: int, vectors: np.ndarray):
+    ids = [f"{document_id}_{i}" for i in range(len(vectors))]
+    store.add(
+        embeddings=vectors,
+        documents=[f"text {chunk_id}" for chunk_id in ids],
+        metadatas=[
+            {"document_id": document_id, "chunk_index": i} for i in range(len(ids))
+        ],
+        ids=ids,
+    )
+    return ids
+
+
+@pytest.fixture
+def store(tmp_path) -> FaissCollection:
+    return FaissCollection(str(tmp_path), dim=DIM)
+
+
+def test_add_and_query(store: FaissCollection):
+    """Test that the nearest chunk comes back with its text and metadata."""
+    vectors = _vectors(5)
+    ids = _add_document(store, 1, vectors)
+
+    results = store.query(query_embeddings=vectors[2:3], n_results=3)
+
+    assert results["ids"][0][0] == ids[2]
+    assert results["documents"][0][0] == f"text {ids[2]}"
+    assert results["metadatas"][0][0] == {"document_id": 1, "chunk_index": 2}
+    assert results["distances"][0][0] == pytest.approx(0.0, abs=1e-5)
+    assert len(results["ids"][0]) == 3
+
+
+def test_get_and_delete(store: FaissCollection):
+    """Test that deleted chunks disappear from get and query."""
+    vectors = _vectors(4)
+    ids = _add_document(store, 1, vectors)
+    assert sorted(store.get(where={"document_id": "1"})["ids"]) == sorted(ids)
+
+    store.delete(ids=ids[:2])
+
+    assert sorted(store.get(where={"document_id": "1"})["ids"]) == sorted(ids[2:])
+    results = store.query(query_embeddings=vectors[:1], n_results=4)
+    assert set(results["ids"][0]) == set(ids[2:])
+
+
+def test_query_where_filters_by_document(store: FaissCollection):
+    """Test that where filters restrict the search to the given documents."""
+    first = _add_document(store, 1, _vectors(5, seed=1))
+    second_vectors = _vectors(5, seed=2)
+    second = _add_document(store, 2, second_vectors)
+
+    results = store.query(
+        query_embeddings=second_vectors[:1],
+        n_results=5,
+        where={"document_id": "1"},
+    )
+    assert set(results["ids"][0]) == set(first)
+
+    results = store.query(
+        query_embeddings=second_vectors[:1],
+        n_results=10,
+        where={"document_id": {"$in": ["1", "2"]}},
+    )
+    assert set(results["ids"][0]) == set(first) | set(second)
+
+    results = store.query(
+        query_embeddings=second_vectors[:1], n_results=5, where={"document_id": "3"}
+    )
+    assert results["ids"] == []
+
+
+def test_readd_replaces_chunk(store: FaissCollection):
+    """Test that re-adding a chunk id replaces its vector and text."""
+    old_vectors = _vectors(3, seed=1)
+    new_vectors = _vectors(3, seed=2)
+    ids = _add_document(store, 1, old_vectors)
+    store.add(
+        embeddings=new_vectors[:1],
+        documents=["replaced"],
+        metadatas=[{"document_id": 1, "chunk_index": 0}],
+        ids=ids[:1],
+    )
+
+    results = store.query(query_embeddings=old_vectors[:1], n_results=3)
+    assert sorted(results["ids"][0]) == sorted(ids)
+    assert "replaced" in results["documents"][0]
+
+    results = store.query(query_embeddings=new_vectors[:1], n_results=1)
+    assert results["ids"][0] == [ids[0]]
+    assert results["distances"][0][0] == pytest.approx(0.0, abs=1e-5)
+
+
+def test_deletes_compact_the_index(store: FaissCollection):
+    """Test that tombstones are dropped once enough of the index is deleted."""
+    ids = _add_document(store, 1, _vectors(8))
+
+    store.delete(ids=ids[:1])
+    assert store.index.ntotal == 8
+
+    store.delete(ids=ids[1:4])
+    assert store.index.ntotal == 4
+    assert sorted(store.get(where={"document_id": "1"})["ids"]) == sorted(ids[4:])
+
+
+def test_reopen_from_persist_dir(tmp_path):
+    """Test that chunks and deletions survive reopening the persist dir."""
+    vectors = _vectors(6)
+    store = FaissCollection(str(tmp_path), dim=DIM)
+    ids = _add_document(store, 1, vectors)
+    store.delete(ids=ids[:1])
+
+    reopened = FaissCollection(str(tmp_path), dim=DIM)
+
+    results = reopened.query(query_embeddings=vectors[:1], n_results=6)
+    assert set(results["ids"][0]) == set(ids[1:])
+    assert sorted(reopened.get(where={"document_id": "1"})["ids"]) == sorted(ids[1:])
+
+
+def test_reopen_skips_vectors_without_rows(tmp_path):
+    """Test recovery from a crash between writing the index and committing rows."""
+    vectors = _vectors(4)
+    store = FaissCollection(str(tmp_path), dim=DIM)
+    ids = _add_document(store, 1, vectors[:2])
+    # The index is saved first, so a crash can only leave orphaned vectors
+    store.index.add_with_ids(vectors[2:], np.array([100, 101], dtype=np.int64))
+    store._save()
+
+    reopened = FaissCollection(str(tmp_path), dim=DIM)
+    results = reopened.query(query_embeddings=vectors[2:3], n_results=4)
+    assert set(results["ids"][0]) == set(ids)
+
+    # New rows never reuse an orphaned id
+    new_ids = _add_document(reopened, 2, vectors[2:])
+    results = reopened.query(query_embeddings=vectors[2:3], n_results=1)
+    assert results["ids"][0] == [new_ids[0]]
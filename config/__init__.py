@@ -3,13 +3,20 @@ Configuration Package
 Laravel-like configuration structure for FastAPI Boilerplate
 """
 
-import json
 import os
 from functools import lru_cache
 from typing import List, Optional
 
-from pydantic import root_validator
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from config._env import env_bool, env_int, env_json
+
+INSECURE_SECRET_DEFAULTS = (
+    "your-secret-key-here",
+    "your-jwt-secret-key-here",
+    "your-secret-key-here-change-in-production",
+    "your-jwt-secret-key-here-change-in-production",
+)
 
 
 class Settings(BaseSettings):
@@ -18,54 +25,60 @@ class Settings(BaseSettings):
     # Database Configuration
     DB_CONNECTION: str = os.getenv("DB_CONNECTION", "postgresql")
     DB_HOST: str = os.getenv("DB_HOST", "localhost")
-    DB_PORT: int = int(os.getenv("DB_PORT", "5432"))
+    DB_PORT: int = env_int("DB_PORT", 5432)
     DB_DATABASE: str = os.getenv("DB_DATABASE", "fastapi_boilerplate")
     DB_USERNAME: str = os.getenv("DB_USERNAME", "postgres")
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "postgres")
     DB_UNIX_SOCKET: str | None = os.getenv("DB_UNIX_SOCKET")
     DB_SSL_MODE: str | None = os.getenv("DB_SSL_MODE")
+    # Connection pool (per engine, per process)
+    DB_POOL_SIZE: int = env_int("DB_POOL_SIZE", 20)
+    DB_MAX_OVERFLOW: int = env_int("DB_MAX_OVERFLOW", 10)
+    DB_POOL_RECYCLE: int = env_int("DB_POOL_RECYCLE", 1800)
 
     # Application Configuration
     APP_NAME: str = os.getenv("APP_NAME", "FastAPI Boilerplate")
     APP_ENV: str = os.getenv("APP_ENV", "local")
-    APP_DEBUG: bool = os.getenv("APP_DEBUG", "false").lower() == "true"
+    APP_DEBUG: bool = env_bool("APP_DEBUG", False)
     APP_URL: str = os.getenv("APP_URL", "http://localhost:8000")
     APP_KEY: str = os.getenv("APP_KEY", "your-secret-key-here-change-in-production")
     APP_TIMEZONE: str = os.getenv("APP_TIMEZONE", "UTC")
-    ENABLE_METRICS: bool = os.getenv("ENABLE_METRICS", "true").lower() == "true"
+    ENABLE_METRICS: bool = env_bool("ENABLE_METRICS", True)
 
     # JWT Configuration
     JWT_SECRET: str = os.getenv(
         "JWT_SECRET", "your-jwt-secret-key-here-change-in-production"
     )
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
-    JWT_EXPIRATION: int = int(os.getenv("JWT_EXPIRATION", "3600"))
+    JWT_EXPIRATION: int = env_int("JWT_EXPIRATION", 3600)
 
     # Redis Configuration
     REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
-    REDIS_PORT: int = int(os.getenv("REDIS_PORT", "6379"))
-    REDIS_DB: int = int(os.getenv("REDIS_DB", "0"))
+    REDIS_PORT: int = env_int("REDIS_PORT", 6379)
+    REDIS_DB: int = env_int("REDIS_DB", 0)
     REDIS_PASSWORD: str | None = os.getenv("REDIS_PASSWORD")
 
     # Cache Configuration
     CACHE_PREFIX: str = os.getenv("CACHE_PREFIX", "cache:")
-    CACHE_DEFAULT_TTL: int = int(os.getenv("CACHE_DEFAULT_TTL", "3600"))
+    CACHE_DEFAULT_TTL: int = env_int("CACHE_DEFAULT_TTL", 3600)
     CACHE_SERIALIZER: str = os.getenv("CACHE_SERIALIZER", "json")
 
     # Rate Limiting Configuration
-    RATE_LIMIT: int = int(os.getenv("RATE_LIMIT", "100"))
-    RATE_LIMIT_WINDOW: int = int(os.getenv("RATE_LIMIT_WINDOW", "60"))
+    RATE_LIMIT: int = env_int("RATE_LIMIT", 100)
+    RATE_LIMIT_WINDOW: int = env_int("RATE_LIMIT_WINDOW", 60)
+    # Hits counted locally before syncing with Redis; 1 checks Redis on every request
+    RATE_LIMIT_SYNC_EVERY: int = env_int("RATE_LIMIT_SYNC_EVERY", 8)
+    # Proxies (IPs or CIDRs) whose X-Forwarded-For header is trusted
+    TRUSTED_PROXIES: list[str] = env_json("TRUSTED_PROXIES", "[]")
 
     # CORS Configuration
-    BACKEND_CORS_ORIGINS: list[str] = json.loads(
-        os.getenv(
-            "BACKEND_CORS_ORIGINS", '["http://localhost:3000","http://localhost:8000"]'
-        )
+    BACKEND_CORS_ORIGINS: list[str] = env_json(
+        "BACKEND_CORS_ORIGINS", '["http://localhost:3000","http://localhost:8000"]'
     )
 
     # Email Configuration
     MAIL_HOST: str = os.getenv("MAIL_HOST", "smtp.mailtrap.io")
-    MAIL_PORT: int = int(os.getenv("MAIL_PORT", "2525"))
+    MAIL_PORT: int = env_int("MAIL_PORT", 2525)
     MAIL_USERNAME: str | None = os.getenv("MAIL_USERNAME")
     MAIL_PASSWORD: str | None = os.getenv("MAIL_PASSWORD")
     MAIL_ENCRYPTION: str = os.getenv("MAIL_ENCRYPTION", "tls")
@@ -75,17 +88,15 @@ class Settings(BaseSettings):
     # Celery Configuration
     CELERY_BROKER_URL: str | None = os.getenv("CELERY_BROKER_URL")
     CELERY_RESULT_BACKEND: str | None = os.getenv("CELERY_RESULT_BACKEND")
-    CELERY_WORKER_CONCURRENCY: int = int(os.getenv("CELERY_WORKER_CONCURRENCY", "4"))
-    CELERY_TASK_TIME_LIMIT: int = int(os.getenv("CELERY_TASK_TIME_LIMIT", "1800"))
-    CELERY_TASK_SOFT_TIME_LIMIT: int = int(
-        os.getenv("CELERY_TASK_SOFT_TIME_LIMIT", "1200")
-    )
+    CELERY_WORKER_CONCURRENCY: int = env_int("CELERY_WORKER_CONCURRENCY", 4)
+    CELERY_TASK_TIME_LIMIT: int = env_int("CELERY_TASK_TIME_LIMIT", 1800)
+    CELERY_TASK_SOFT_TIME_LIMIT: int = env_int("CELERY_TASK_SOFT_TIME_LIMIT", 1200)
 
     # Logging Configuration
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     LOG_FILE: str = os.getenv("LOG_FILE", "logs/app.log")
-    LOG_MAX_SIZE: int = int(os.getenv("LOG_MAX_SIZE", "10485760"))
-    LOG_BACKUP_COUNT: int = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+    LOG_MAX_SIZE: int = env_int("LOG_MAX_SIZE", 10485760)
+    LOG_BACKUP_COUNT: int = env_int("LOG_BACKUP_COUNT", 5)
 
     # Broadcasting Configuration
     BROADCAST_DRIVER: str = os.getenv("BROADCAST_DRIVER", "redis")
@@ -95,9 +106,9 @@ class Settings(BaseSettings):
     PUSHER_APP_SECRET: str | None = os.getenv("PUSHER_APP_SECRET")
     PUSHER_APP_CLUSTER: str = os.getenv("PUSHER_APP_CLUSTER", "mt1")
     PUSHER_HOST: str | None = os.getenv("PUSHER_HOST")
-    PUSHER_PORT: int = int(os.getenv("PUSHER_PORT", "443"))
+    PUSHER_PORT: int = env_int("PUSHER_PORT", 443)
     PUSHER_SCHEME: str = os.getenv("PUSHER_SCHEME", "https")
-    PUSHER_ENCRYPTED: bool = os.getenv("PUSHER_ENCRYPTED", "true").lower() == "true"
+    PUSHER_ENCRYPTED: bool = env_bool("PUSHER_ENCRYPTED", True)
     ABLY_KEY: str | None = os.getenv("ABLY_KEY")
 
     # Filesystem Configuration
@@ -111,11 +122,11 @@ class Settings(BaseSettings):
     AWS_BUCKET: str | None = os.getenv("AWS_BUCKET")
     AWS_ENDPOINT: str | None = os.getenv("AWS_ENDPOINT")
     FTP_HOST: str = os.getenv("FTP_HOST", "localhost")
-    FTP_PORT: int = int(os.getenv("FTP_PORT", "21"))
+    FTP_PORT: int = env_int("FTP_PORT", 21)
     FTP_USERNAME: str | None = os.getenv("FTP_USERNAME")
     FTP_PASSWORD: str | None = os.getenv("FTP_PASSWORD")
     SFTP_HOST: str = os.getenv("SFTP_HOST", "localhost")
-    SFTP_PORT: int = int(os.getenv("SFTP_PORT", "22"))
+    SFTP_PORT: int = env_int("SFTP_PORT", 22)
     SFTP_USERNAME: str | None = os.getenv("SFTP_USERNAME")
     SFTP_PASSWORD: str | None = os.getenv("SFTP_PASSWORD")
     SFTP_KEY: str | None = os.getenv("SFTP_KEY")
@@ -130,51 +141,44 @@ class Settings(BaseSettings):
     )
 
     # RAG Configuration
+    ENABLE_RAG: bool = env_bool("ENABLE_RAG", True)
     EMBEDDING_MODEL: str = os.getenv(
         "EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2"
     )
     CHROMA_PERSIST_DIR: str = os.getenv("CHROMA_PERSIST_DIR", "./chroma_db")
+    # "chroma" or "faiss" (requires the faiss extra)
+    VECTOR_STORE: str = os.getenv("VECTOR_STORE", "chroma")
+    FAISS_PERSIST_DIR: str = os.getenv("FAISS_PERSIST_DIR", "./faiss_index")
+
+    # Settings are read once at startup and never mutated. Unknown keys in
+    # .env (e.g. for docker-compose or other tools) are ignored, not rejected.
+    model_config = SettingsConfigDict(
+        env_file=".env", case_sensitive=True, frozen=True, extra="ignore"
+    )
+
+
+def validate_production_secrets(settings: Settings) -> None:
+    """
+    Validate that secrets are set and not using defaults. Called once at
+    application startup when APP_ENV is production.
+    """
+    if settings.APP_KEY in INSECURE_SECRET_DEFAULTS:
+        raise ValueError(
+            "APP_KEY must be set to a secure random value in production. "
+            "Generate one with: "
+            'python -c "import secrets; print(secrets.token_urlsafe(32))"'
+        )
+    if settings.JWT_SECRET in INSECURE_SECRET_DEFAULTS:
+        raise ValueError(
+            "JWT_SECRET must be set to a secure random value in production. "
+            "Generate one with: "
+            'python -c "import secrets; print(secrets.token_urlsafe(32))"'
+        )
 
-    @root_validator(skip_on_failure=True)
-    def validate_secrets(cls, values):
-        """Validate that secrets are set and not using defaults in production."""
-        insecure_defaults = [
-            "your-secret-key-here",
-            "your-jwt-secret-key-here",
-            "your-secret-key-here-change-in-production",
-            "your-jwt-secret-key-here-change-in-production",
-        ]
-
-        # Only validate in production
-        if values.get("APP_ENV") == "production":
-            app_key = values.get("APP_KEY", "")
-            jwt_secret = values.get("JWT_SECRET", "")
-
-            if app_key in insecure_defaults:
-                raise ValueError(
-                    "APP_KEY must be set to a secure random value in production. "
-                    'Generate one with: python -c "import secrets; print(secrets.token_urlsafe(32))"'
-                )
-            if jwt_secret in insecure_defaults:
-                raise ValueError(
-                    "JWT_SECRET must be set to a secure random value in production. "
-                    'Generate one with: python -c "import secrets; print(secrets.token_urlsafe(32))"'
-                )
-
-            if len(app_key) < 32:
-                raise ValueError(
-                    "APP_KEY must be at least 32 characters long for security"
-                )
-            if len(jwt_secret) < 32:
-                raise ValueError(
-                    "JWT_SECRET must be at least 32 characters long for security"
-                )
-
-        return values
-
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    if len(settings.APP_KEY) < 32:
+        raise ValueError("APP_KEY must be at least 32 characters long for security")
+    if len(settings.JWT_SECRET) < 32:
+        raise ValueError("JWT_SECRET must be at least 32 characters long for security")
 
 
 @lru_cache
@@ -0,0 +1,30 @@
+"""
+Typed Environment Readers
+Parse each variable once; repeated reads are cache hits.
+"""
+
+import os
+from functools import cache
+from typing import Any
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+
+@cache
+def env_int(key: str, default: int) -> int:
+    return int(os.environ.get(key, default))
+
+
+@cache
+def env_bool(key: str, default: bool = False) -> bool:
+    value = os.environ.get(key)
+    return default if value is None else value.lower() == "true"
+
+
+@cache
+def env_json(key: str, default: str) -> Any:
+    """Parse a JSON variable. The result is shared between callers; don't mutate it."""
+    return json_loads(os.environ.get(key, default))
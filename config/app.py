@@ -3,13 +3,13 @@ Application Configuration
 Similar to Laravel's config/app.php
 """
 
-import os
+from config import settings
 
 app_config = {
-    "name": os.getenv("APP_NAME", "FastAPI Boilerplate"),
-    "env": os.getenv("APP_ENV", "local"),
-    "debug": os.getenv("APP_DEBUG", "false").lower() == "true",
-    "url": os.getenv("APP_URL", "http://localhost:8000"),
-    "key": os.getenv("APP_KEY", "your-secret-key-here-change-in-production"),
-    "timezone": os.getenv("APP_TIMEZONE", "UTC"),
+    "name": settings.APP_NAME,
+    "env": settings.APP_ENV,
+    "debug": settings.APP_DEBUG,
+    "url": settings.APP_URL,
+    "key": settings.APP_KEY,
+    "timezone": settings.APP_TIMEZONE,
 }
@@ -3,18 +3,18 @@ Broadcasting Configuration
 Similar to Laravel's config/broadcasting.php
 """
 
-import os
+from config import settings
 
 broadcasting_config = {
-    "driver": os.getenv("BROADCAST_DRIVER", "redis"),
-    "connection": os.getenv("BROADCAST_CONNECTION", "default"),
-    "pusher_app_id": os.getenv("PUSHER_APP_ID"),
-    "pusher_app_key": os.getenv("PUSHER_APP_KEY"),
-    "pusher_app_secret": os.getenv("PUSHER_APP_SECRET"),
-    "pusher_app_cluster": os.getenv("PUSHER_APP_CLUSTER", "mt1"),
-    "pusher_host": os.getenv("PUSHER_HOST"),
-    "pusher_port": int(os.getenv("PUSHER_PORT", "443")),
-    "pusher_scheme": os.getenv("PUSHER_SCHEME", "https"),
-    "pusher_encrypted": os.getenv("PUSHER_ENCRYPTED", "true").lower() == "true",
-    "ably_key": os.getenv("ABLY_KEY"),
+    "driver": settings.BROADCAST_DRIVER,
+    "connection": settings.BROADCAST_CONNECTION,
+    "pusher_app_id": settings.PUSHER_APP_ID,
+    "pusher_app_key": settings.PUSHER_APP_KEY,
+    "pusher_app_secret": settings.PUSHER_APP_SECRET,
+    "pusher_app_cluster": settings.PUSHER_APP_CLUSTER,
+    "pusher_host": settings.PUSHER_HOST,
+    "pusher_port": settings.PUSHER_PORT,
+    "pusher_scheme": settings.PUSHER_SCHEME,
+    "pusher_encrypted": settings.PUSHER_ENCRYPTED,
+    "ably_key": settings.ABLY_KEY,
 }
@@ -2,12 +2,12 @@
 Celery Configuration
 """
 
-import os
+from config import settings
 
 celery_config = {
-    "broker_url": os.getenv("CELERY_BROKER_URL"),
-    "result_backend": os.getenv("CELERY_RESULT_BACKEND"),
-    "worker_concurrency": int(os.getenv("CELERY_WORKER_CONCURRENCY", "4")),
-    "task_time_limit": int(os.getenv("CELERY_TASK_TIME_LIMIT", "1800")),
-    "task_soft_time_limit": int(os.getenv("CELERY_TASK_SOFT_TIME_LIMIT", "1200")),
+    "broker_url": settings.CELERY_BROKER_URL,
+    "result_backend": settings.CELERY_RESULT_BACKEND,
+    "worker_concurrency": settings.CELERY_WORKER_CONCURRENCY,
+    "task_time_limit": settings.CELERY_TASK_TIME_LIMIT,
+    "task_soft_time_limit": settings.CELERY_TASK_SOFT_TIME_LIMIT,
 }
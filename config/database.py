@@ -3,15 +3,18 @@ Database Configuration
 Similar to Laravel's config/database.php
 """
 
-import os
+from config import settings
 
 database_config = {
-    "connection": os.getenv("DB_CONNECTION", "postgresql"),
-    "host": os.getenv("DB_HOST", "localhost"),
-    "port": int(os.getenv("DB_PORT", "5432")),
-    "database": os.getenv("DB_DATABASE", "fastapi_boilerplate"),
-    "username": os.getenv("DB_USERNAME", "postgres"),
-    "password": os.getenv("DB_PASSWORD", "postgres"),
-    "unix_socket": os.getenv("DB_UNIX_SOCKET"),
-    "ssl_mode": os.getenv("DB_SSL_MODE"),
+    "connection": settings.DB_CONNECTION,
+    "host": settings.DB_HOST,
+    "port": settings.DB_PORT,
+    "database": settings.DB_DATABASE,
+    "username": settings.DB_USERNAME,
+    "password": settings.DB_PASSWORD,
+    "unix_socket": settings.DB_UNIX_SOCKET,
+    "ssl_mode": settings.DB_SSL_MODE,
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_recycle": settings.DB_POOL_RECYCLE,
 }
@@ -3,25 +3,25 @@ Filesystem Configuration
 Similar to Laravel's config/filesystems.php
 """
 
-import os
+from config import settings
 
 filesystems_config = {
-    "disk": os.getenv("FILESYSTEM_DISK", "local"),
-    "root": os.getenv("FILESYSTEM_ROOT", "storage/app"),
-    "public_root": os.getenv("FILESYSTEM_PUBLIC_ROOT", "public/storage"),
-    "url": os.getenv("FILESYSTEM_URL"),
-    "aws_access_key_id": os.getenv("AWS_ACCESS_KEY_ID"),
-    "aws_secret_access_key": os.getenv("AWS_SECRET_ACCESS_KEY"),
-    "aws_default_region": os.getenv("AWS_DEFAULT_REGION", "us-east-1"),
-    "aws_bucket": os.getenv("AWS_BUCKET"),
-    "aws_endpoint": os.getenv("AWS_ENDPOINT"),
-    "ftp_host": os.getenv("FTP_HOST", "localhost"),
-    "ftp_port": int(os.getenv("FTP_PORT", "21")),
-    "ftp_username": os.getenv("FTP_USERNAME"),
-    "ftp_password": os.getenv("FTP_PASSWORD"),
-    "sftp_host": os.getenv("SFTP_HOST", "localhost"),
-    "sftp_port": int(os.getenv("SFTP_PORT", "22")),
-    "sftp_username": os.getenv("SFTP_USERNAME"),
-    "sftp_password": os.getenv("SFTP_PASSWORD"),
-    "sftp_key": os.getenv("SFTP_KEY"),
+    "disk": settings.FILESYSTEM_DISK,
+    "root": settings.FILESYSTEM_ROOT,
+    "public_root": settings.FILESYSTEM_PUBLIC_ROOT,
+    "url": settings.FILESYSTEM_URL,
+    "aws_access_key_id": settings.AWS_ACCESS_KEY_ID,
+    "aws_secret_access_key": settings.AWS_SECRET_ACCESS_KEY,
+    "aws_default_region": settings.AWS_DEFAULT_REGION,
+    "aws_bucket": settings.AWS_BUCKET,
+    "aws_endpoint": settings.AWS_ENDPOINT,
+    "ftp_host": settings.FTP_HOST,
+    "ftp_port": settings.FTP_PORT,
+    "ftp_username": settings.FTP_USERNAME,
+    "ftp_password": settings.FTP_PASSWORD,
+    "sftp_host": settings.SFTP_HOST,
+    "sftp_port": settings.SFTP_PORT,
+    "sftp_username": settings.SFTP_USERNAME,
+    "sftp_password": settings.SFTP_PASSWORD,
+    "sftp_key": settings.SFTP_KEY,
 }
@@ -2,10 +2,10 @@
 JWT Configuration
 """
 
-import os
+from config import settings
 
 jwt_config = {
-    "secret": os.getenv("JWT_SECRET", "your-jwt-secret-key-here-change-in-production"),
-    "algorithm": os.getenv("JWT_ALGORITHM", "HS256"),
-    "expiration": int(os.getenv("JWT_EXPIRATION", "3600")),
+    "secret": settings.JWT_SECRET,
+    "algorithm": settings.JWT_ALGORITHM,
+    "expiration": settings.JWT_EXPIRATION,
 }
@@ -2,11 +2,11 @@
 Logging Configuration
 """
 
-import os
+from config import settings
 
 logging_config = {
-    "level": os.getenv("LOG_LEVEL", "INFO"),
-    "file": os.getenv("LOG_FILE", "logs/app.log"),
-    "max_size": int(os.getenv("LOG_MAX_SIZE", "10485760")),
-    "backup_count": int(os.getenv("LOG_BACKUP_COUNT", "5")),
+    "level": settings.LOG_LEVEL,
+    "file": settings.LOG_FILE,
+    "max_size": settings.LOG_MAX_SIZE,
+    "backup_count": settings.LOG_BACKUP_COUNT,
 }
@@ -2,9 +2,11 @@
 Rate Limit Configuration
 """
 
-import os
+from config import settings
 
 rate_limit_config = {
-    "limit": int(os.getenv("RATE_LIMIT", "100")),
-    "window": int(os.getenv("RATE_LIMIT_WINDOW", "60")),
+    "limit": settings.RATE_LIMIT,
+    "window": settings.RATE_LIMIT_WINDOW,
+    "sync_every": settings.RATE_LIMIT_SYNC_EVERY,
+    "trusted_proxies": settings.TRUSTED_PROXIES,
 }
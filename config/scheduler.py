@@ -2,8 +2,8 @@
 Scheduler Configuration
 """
 
-import os
+from config import settings
 
 scheduler_config = {
-    "timezone": os.getenv("APP_TIMEZONE", "UTC"),
+    "timezone": settings.APP_TIMEZONE,
 }
@@ -7,8 +7,8 @@ from app.api.v1.controllers import (
     users,
     books,
     documents,
-    qa,
 )
+from config import settings
 
 
 def register_api_routes() -> APIRouter:
@@ -36,7 +36,11 @@ def register_api_routes() -> APIRouter:
     # Document management routes (require authentication)
     api_router.include_router(documents.router, prefix="/documents", tags=["documents"])
 
-    # Q&A routes (require authentication)
-    api_router.include_router(qa.router, prefix="/qa", tags=["qa"])
+    # Q&A routes (require authentication); the qa controller is only
+    # imported when RAG is enabled
+    if settings.ENABLE_RAG:
+        from app.api.v1.controllers import qa
+
+        api_router.include_router(qa.router, prefix="/qa", tags=["qa"])
 
     return api_router